@@ -63,6 +63,14 @@ my_rest_api_v1.register_group(group=api_group_users)
 my_rest_api_v1.register_group(group=api_group_tags)
 my_rest_api_v1.register_group(group=api_group_dashboard)
 
+# All endpoints are registered; freeze the groups so the list of
+# endpoints doesn't have to be created for every request
+logger.debug('Freezing groups')
+my_rest_api_v1.freeze()
+
+# Create the routing tables now, so the first requests don't have to
+my_rest_api_v1.warmup()
+
 # The RESTAPIGenerator object works with a Blueprint object that can be
 # added to the Flask app. By doing this.
 logger.debug('Adding REST API blueprint to the Flask app')
@@ -2,7 +2,7 @@
     used by the REST API to authorize API requests. """
 import logging
 from datetime import datetime
-from typing import List, Optional, Union
+from typing import FrozenSet, Optional, Union
 
 from my_database.api_tokens import get_api_tokens
 from my_database_model.api_token import APIToken
@@ -13,7 +13,7 @@ from rest_api_generator.rest_api_generator import (BasicAuthorization,
 
 def authorization(
         auth: Optional[Union[BasicAuthorization, BearerAuthorzation]],
-        scopes: Optional[List[str]]) -> Authorization:
+        scopes: Optional[FrozenSet[str]]) -> Authorization:
     """
         Method that does the authentication for the REST API.
 
@@ -24,7 +24,7 @@ def authorization(
             None, a BasicAuthorization object or a BearerAuthorization
             object, depending on the given authorization.
 
-        scopes : Optional[List[str]]
+        scopes : Optional[FrozenSet[str]]
             The scopes that are defined in the endpoint that are
             required for this endpoint.
 
@@ -40,9 +40,10 @@ def authorization(
     # Create a authorization object
     auth_object: Authorization = Authorization()
 
-    if type(scopes) is list:
+    if scopes is not None:
         logger.debug(
-            f'Authorizing request started. Scopes: {",".join(scopes)}')
+            'Authorizing request started. Scopes: ' +
+            ','.join(sorted(scopes)))
 
     # Check the type of authorization we received. We only accept the
     # 'Bearer' kind, since that is being used in OAuth world.
@@ -93,10 +94,10 @@ def authorization(
             return auth_object
 
     # Get the associated scopes
-    token_scopes = [
+    token_scopes = {
         token_scope.scope.full_scope_name
         for token_scope in token_object.token_scopes
-    ]
+    }
 
     # Check if any of the given scopes is in the 'token scopes'
     for scope in scopes:
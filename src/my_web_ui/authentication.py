@@ -3,7 +3,7 @@
 
 from typing import Optional
 
-from flask.globals import session
+from flask.globals import g, session
 
 from my_database.exceptions import NotFoundError
 from my_database.user_sessions import get_user_sessions
@@ -13,7 +13,47 @@ from my_database_model import UserSession
 def get_active_user_session() -> Optional[UserSession]:
     """ Method to check if the Flask Session contains valid information
         for a user session and returns the UserSession Object for the
-        session.
+        session. The result is memoized in the Flask application
+        context for the lifetime of the request, keyed on the session
+        ID and secret. This way, multiple code paths that need the user
+        during one request only query the database once.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        UserSession
+            The UserSession object for the session.
+
+        None
+            There is no (valid) user session found in the Flask
+            Session.
+    """
+
+    # Check if we already resolved the session in this request. We
+    # only reuse the result when the session ID and secret are the
+    # same; if the session changed during the request (for instance,
+    # because the user logged in), we resolve it again.
+    session_key = (session.get('sid'), session.get('secret'))
+    cached = g.get('active_user_session')
+    if cached is not None and cached[0] == session_key:
+        return cached[1]
+
+    # Resolve the session and save it for the rest of the request
+    user_session = _resolve_active_user_session()
+    g.active_user_session = (
+        (session.get('sid'), session.get('secret')),
+        user_session
+    )
+    return user_session
+
+
+def _resolve_active_user_session() -> Optional[UserSession]:
+    """ Method that does the actual check if the Flask Session contains
+        valid information for a user session. Returns the UserSession
+        object for the session.
 
         Parameters
         ----------
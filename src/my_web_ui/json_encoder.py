@@ -94,17 +94,11 @@ class WebUIJSONEncoder(JSONEncoder):
                 A dictionary the JSON encoder can encode.
         """
 
-        # Get the fields that we should hide
-        try:
-            fields_to_hide = object.api_hide_fields
-        except AttributeError:
-            fields_to_hide = list()
-
-        # Get the fields that we just have to set to True if they are set
-        try:
-            fields_to_mask = object.api_mask_fields
-        except AttributeError:
-            fields_to_mask = list()
+        # Get the fields that we should hide and the fields that we
+        # just have to set to True if they are set. We use a default
+        # so models without these fields don't raise an AttributeError
+        fields_to_hide = getattr(object, 'api_hide_fields', ())
+        fields_to_mask = getattr(object, 'api_mask_fields', ())
 
         # Get the columns
         columns = [column.name for column in type(object).__table__.columns]
@@ -122,17 +116,11 @@ class WebUIJSONEncoder(JSONEncoder):
                 column_dict[field] = column_dict[field] != None
 
         # Add fields that are in the 'api_extra_fields' list
-        try:
-            api_extra_fields = object.api_extra_fields
-        except AttributeError:
-            api_extra_fields = list()
+        api_extra_fields = getattr(object, 'api_extra_fields', ())
 
         # Loop through the extra fields and add them to the outgoing dict
         for extra_field in api_extra_fields:
-            try:
-                column_dict[extra_field] = object.__getattribute__(extra_field)
-            except AttributeError:
-                column_dict[extra_field] = None
+            column_dict[extra_field] = getattr(object, extra_field, None)
 
         # And we return that dict
         return column_dict
@@ -2,15 +2,17 @@
 """
 
 import re
-from dataclasses import dataclass, field
-from typing import Callable, List, Optional
+from dataclasses import dataclass, field, fields
+from inspect import iscoroutinefunction
+from typing import (Callable, Dict, FrozenSet, Iterable, List, Optional,
+                    Union)
 
 from rest_api_generator.authorization import Authorization
 from rest_api_generator.endpoint_scopes import EndpointScopes
 from rest_api_generator.response import Response
 
 
-@dataclass
+@dataclass(slots=True)
 class Endpoint:
     """ Class that represent a API endpoint
 
@@ -20,10 +22,12 @@ class Endpoint:
             The URL suffix for the endpoint.
 
         func : Callable[[], Response]
-            The function to run for this endpoint.
+            The function to run for this endpoint. Can be a coroutine
+            function; it is then run in a event loop for every request.
 
-        http_methods : List[str] [default=list()]
-            HTTP methods that this API endpoint supports.
+        http_methods : FrozenSet[str] [default=frozenset()]
+            HTTP methods that this API endpoint supports. Other
+            iterables are converted to a frozenset.
 
         name : str [default='']
             The name for the API endpoint. Is used in help pages.
@@ -38,6 +42,25 @@ class Endpoint:
         auth_scopes : Optional[EndpointScope] [default=None]
             A list of permissions which the user needs at least one of
             to authorize for this endpoint.
+
+        cacheable : bool [default=False]
+            Determines if the responses for GET requests for this
+            endpoint can be cached. Only set this for endpoints that
+            return the same result for the same URL, arguments and
+            Authorization header.
+
+        cache_ttl : float [default=0]
+            The number of seconds a cached response for this endpoint
+            can be used. With 0, cached responses don't expire; they
+            are only removed when the cache is full or invalidated.
+
+        scopes_by_method : Dict[str, Optional[FrozenSet[str]]]
+            The auth scopes per HTTP method. Is created from
+            `auth_scopes` when the object is created.
+
+        is_coroutine : bool
+            Specifies if `func` is a coroutine function. Is set when
+            the object is created.
     """
 
     # Mandatory members
@@ -46,7 +69,7 @@ class Endpoint:
         Optional[Authorization],
         Optional[re.Match]
     ], Response]
-    http_methods: List[str] = field(default_factory=list)
+    http_methods: Union[FrozenSet[str], Iterable[str]] = frozenset()
 
     # Members for help pages
     name: Optional[str] = ''
@@ -55,3 +78,37 @@ class Endpoint:
     # Members for authentication
     auth_needed: Optional[bool] = False
     auth_scopes: Optional[EndpointScopes] = None
+
+    # Members for caching
+    cacheable: bool = False
+    cache_ttl: float = 0
+    scopes_by_method: Dict[str, Optional[FrozenSet[str]]] = field(
+        init=False, repr=False, compare=False)
+    is_coroutine: bool = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """ Converts the HTTP methods to a frozenset, so checking if a
+            method is allowed doesn't have to loop over a list, and
+            creates the dict with the auth scopes per HTTP method. Also
+            checks if the function for the endpoint is a coroutine
+            function.
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            None
+        """
+        if self.http_methods is not None:
+            self.http_methods = frozenset(self.http_methods)
+
+        self.scopes_by_method = dict()
+        if self.auth_scopes is not None:
+            self.scopes_by_method = {
+                scope_field.name: getattr(self.auth_scopes, scope_field.name)
+                for scope_field in fields(self.auth_scopes)
+            }
+
+        self.is_coroutine = iscoroutinefunction(self.func)
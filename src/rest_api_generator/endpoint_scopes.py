@@ -1,35 +1,54 @@
 """ This module includes the EndpointScopes class which is a object
     that contains the auth scopes for a specific Endpoint. """
 
-from dataclasses import dataclass
-from typing import List, Optional
+from dataclasses import dataclass, fields
+from typing import FrozenSet, Iterable, Optional, Union
 
 
-@dataclass
+@dataclass(slots=True)
 class EndpointScopes:
     """ Class used to create objects that contain the auth scopes for a
-        specific Endpoint
+        specific Endpoint. The scopes can be given as any iterable, like
+        a list, and are saved as a frozenset so checking if a scope is
+        in it is a O(1) operation.
 
         Members
         -------
-        POST : List[str] [default=None]
+        POST : FrozenSet[str] [default=None]
             The permissions for a POST request
 
-        GET : List[str] [default=None]
+        GET : FrozenSet[str] [default=None]
             The permissions for a GET request
 
-        PUT : List[str] [default=None]
+        PUT : FrozenSet[str] [default=None]
             The permissions for a PUT request
 
-        PATCH : List[str] [default=None]
+        PATCH : FrozenSet[str] [default=None]
             The permissions for a PATCH request
 
-        DELETE : List[str] [default=None]
+        DELETE : FrozenSet[str] [default=None]
             The permissions for a DELETE request
     """
 
-    POST: Optional[List[str]] = None
-    GET: Optional[List[str]] = None
-    PUT: Optional[List[str]] = None
-    PATCH: Optional[List[str]] = None
-    DELETE: Optional[List[str]] = None
+    POST: Optional[Union[FrozenSet[str], Iterable[str]]] = None
+    GET: Optional[Union[FrozenSet[str], Iterable[str]]] = None
+    PUT: Optional[Union[FrozenSet[str], Iterable[str]]] = None
+    PATCH: Optional[Union[FrozenSet[str], Iterable[str]]] = None
+    DELETE: Optional[Union[FrozenSet[str], Iterable[str]]] = None
+
+    def __post_init__(self) -> None:
+        """ Converts the given scopes to frozensets. This is done once,
+            when the endpoint gets registered.
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            None
+        """
+        for field in fields(self):
+            scopes = getattr(self, field.name)
+            if scopes is not None:
+                setattr(self, field.name, frozenset(scopes))
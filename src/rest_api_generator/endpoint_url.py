@@ -1,11 +1,13 @@
 """ This module includes the EndpointURL which is a object that
     contains the URL for and endpoint and Endpoint object. """
 
-from dataclasses import dataclass
+import re
+from dataclasses import dataclass, field
+
 from rest_api_generator.endpoint import Endpoint
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class EndpointURL:
     """ Class used to create objects that contain a URL as string and
         a Endpoint object.
@@ -17,7 +19,27 @@ class EndpointURL:
 
         endpoint : Endpoint
             The endpoint object for the endpoint
+
+        pattern : re.Pattern
+            The compiled regex for the URL. Is created when the object
+            is created.
     """
 
     url: str
     endpoint: Endpoint
+    pattern: re.Pattern = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """ Compiles the regex for the URL, so it doesn't have to be
+            compiled (or looked up in the cache of the `re` module) for
+            every request.
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            None
+        """
+        object.__setattr__(self, 'pattern', re.compile(self.url))
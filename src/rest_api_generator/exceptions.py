@@ -23,6 +23,26 @@ class InvalidGroupError(RESTAPIGeneratorCriticalError):
     pass
 
 
+class GroupFrozenError(RESTAPIGeneratorCriticalError):
+    """ Error that happens when the programmer tries to add a endpoint
+        or subgroup to a group that is already frozen. """
+    pass
+
+
+class BlueprintRegisteredError(RESTAPIGeneratorCriticalError):
+    """ Error that happens when the programmer tries to change the
+        accepted HTTP methods after the Blueprint is registered in a
+        Flask app. Flask doesn't read the methods again after that. """
+    pass
+
+
+class URLNotFoundError(RESTAPIGeneratorError):
+    """ Error that happens when no endpoint is found for a path. Is
+        raised from the URL cache, so paths that are not found are not
+        cached. """
+    pass
+
+
 class UnauthorizedForResourceError(RESTAPIGeneratorEndpointError):
     """ Exception that indicates that a user is trying to access a
         resource that he or she has no permissions to. Should be
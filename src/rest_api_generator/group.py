@@ -2,12 +2,13 @@
 
 import re
 from logging import getLogger
-from typing import Callable, List, Optional
+from typing import Callable, List, Optional, Tuple
 
 from rest_api_generator.authorization import Authorization
 from rest_api_generator.endpoint import Endpoint
 from rest_api_generator.endpoint_scopes import EndpointScopes
 from rest_api_generator.endpoint_url import EndpointURL
+from rest_api_generator.exceptions import GroupFrozenError
 from rest_api_generator.response import Response
 
 
@@ -64,6 +65,19 @@ class Group:
         # Create a empty list of subgroups
         self.subgroups: List[Group] = list()
 
+        # When the group is frozen, the flattened list of endpoints
+        # for this group and it's subgroups is saved so it doesn't
+        # have to be recreated on every request.
+        self._frozen: bool = False
+        self._flat: Optional[Tuple[EndpointURL, ...]] = None
+
+        # Functions to call when a endpoint or subgroup is added to
+        # this group or one of it's subgroups, and the groups this group
+        # is a subgroup of. The RESTAPIGenerator uses this to recreate
+        # it's routing tables.
+        self._change_callbacks: List[Callable[[], None]] = list()
+        self._parents: List[Group] = list()
+
     def __repr__(self):
         """ Represents objects of this class. """
         return f'<Group for "{self.name}" at {self.id}>'
@@ -80,8 +94,44 @@ class Group:
             -------
             None
         """
+        self._check_not_frozen()
         self.logger.debug(f'Adding subgroup: {group.name}')
         self.subgroups.append(group)
+        group._parents.append(self)
+        self._changed()
+
+    def add_change_callback(self, callback: Callable[[], None]) -> None:
+        """ Method to add a function that is called when a endpoint or
+            subgroup is added to this group or one of it's subgroups.
+
+            Parameters
+            ----------
+            callback : Callable[[], None]
+                The function to call.
+
+            Returns
+            -------
+            None
+        """
+        if callback not in self._change_callbacks:
+            self._change_callbacks.append(callback)
+
+    def _changed(self) -> None:
+        """ Method that calls the change callbacks of this group and
+            the groups this group is a subgroup of.
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            None
+        """
+        for callback in self._change_callbacks:
+            callback()
+        for group in self._parents:
+            group._changed()
 
     def register_endpoint(
             self,
@@ -91,7 +141,9 @@ class Group:
             description: str = None,
             auth_needed: bool = False,
             auth_scopes:
-            Optional[EndpointScopes] = None) -> Callable:
+            Optional[EndpointScopes] = None,
+            cacheable: bool = False,
+            cache_ttl: float = 0) -> Callable:
         """ Decorator to register a endpoint for this REST API group
 
             Parameters
@@ -120,12 +172,22 @@ class Group:
                 registered auth method, the user can use this
                 information to authorize a request.
 
+            cacheable : bool [default=False]
+                Specifies if the responses for GET requests for this
+                endpoint can be cached by the API generator.
+
+            cache_ttl : float [default=0]
+                The number of seconds a cached response can be used.
+                With 0, cached responses don't expire.
+
             Returns
             -------
             Callable
                 The decorator
         """
 
+        self._check_not_frozen()
+
         def decorator(func: Callable[[
             Optional[Authorization],
             Optional[re.Match]
@@ -145,6 +207,8 @@ class Group:
                 func : Callable[]
                     The function that is given
             """
+            self._check_not_frozen()
+
             # Add the endpoint to the list
             endpoint: Endpoint = Endpoint(
                 url_suffix=url_suffix,
@@ -153,9 +217,12 @@ class Group:
                 name=name,
                 description=description,
                 auth_needed=auth_needed,
-                auth_scopes=auth_scopes
+                auth_scopes=auth_scopes,
+                cacheable=cacheable,
+                cache_ttl=cache_ttl
             )
             self.endpoints.append(endpoint)
+            self._changed()
 
             self.logger.debug(f'Registered endpoint: {endpoint.name}')
 
@@ -165,10 +232,54 @@ class Group:
         # Return the decorator
         return decorator
 
-    def get_endpoints(self) -> List[EndpointURL]:
-        """ Method that returns a list with EndpointURL objects.
+    def freeze(self) -> None:
+        """ Method to freeze the group. Walks the tree of subgroups
+            once and saves the flattened list of endpoints. After
+            freezing, no endpoints or subgroups can be added to this
+            group or it's subgroups.
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            None
+        """
+
+        if self._frozen:
+            return
+
+        self.logger.debug('Freezing group')
+
+        # Freeze the subgroups first, so they can't be changed anymore
+        for group in self.subgroups:
+            group.freeze()
+
+        self._flat = tuple(self._collect_endpoints(''))
+        self._frozen = True
+
+    def _check_not_frozen(self) -> None:
+        """ Method that raises an exception if the group is frozen.
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            None
+        """
+        if self._frozen:
+            raise GroupFrozenError(
+                f'Group "{self.name}" is frozen and cannot be changed')
+
+    def get_endpoints(self) -> Tuple[EndpointURL, ...]:
+        """ Method that returns a tuple with EndpointURL objects.
             These objects contain the URL and Endpoint objects
             for all registered endpoints in this group and subgroup.
+            If the group is frozen, the flattened tuple that was
+            created when freezing the group is returned.
 
             Parameter
             ---------
@@ -176,15 +287,41 @@ class Group:
 
             Returns
             -------
-            list[EndpointURL]
-                A list with EndpointURLs for this group and it's
+            tuple[EndpointURL]
+                A tuple with EndpointURLs for this group and it's
                 subgroups
         """
 
+        if self._flat is not None:
+            return self._flat
+
         self.logger.debug('Creating list of endpoint URLs')
+        return_list = tuple(self._collect_endpoints(''))
+        self.logger.debug('Created list')
+
+        # Return the list
+        return return_list
+
+    def _collect_endpoints(self, prefix: str) -> List[EndpointURL]:
+        """ Method that creates a list with EndpointURL objects for
+            this group and it's subgroups. The given prefix is
+            prepended to the URLs.
+
+            Parameter
+            ---------
+            prefix : str
+                The prefix to prepend to the URLs of the endpoints.
+
+            Returns
+            -------
+            list[EndpointURL]
+                A list with EndpointURLs for this group and it's
+                subgroups
+        """
 
         # Create a empty list that we can fill to return
         return_list: List[EndpointURL] = list()
+        prefix = f'{prefix}{self.url_prefix}'
 
         # Add local endpoints
         for endpoint in self.endpoints:
@@ -192,25 +329,17 @@ class Group:
             for suffixes in endpoint.url_suffix:
                 # Create a object
                 endpoint_url = EndpointURL(
-                    url=f'{self.url_prefix}{suffixes}',
+                    url=f'{prefix}{suffixes}',
                     endpoint=endpoint
                 )
 
                 # Add it to the list
                 return_list.append(endpoint_url)
 
-        # Add endpoints from subgroups. We prepend the URL prefix for
-        # this group to it so we get a full URL
+        # Add endpoints from subgroups. We give the prefix for this
+        # group to it so we get a full URL
         for group in self.subgroups:
-            # Get the endpoints and prepend the local prefix
-            endpoint_list: List[EndpointURL] = group.get_endpoints()
-            for endpoint in endpoint_list:
-                endpoint.url = f'{self.url_prefix}{endpoint.url}'
-
-            # Add the endpoints to the return list
-            return_list += endpoint_list
-
-        self.logger.debug('Created list')
+            return_list += group._collect_endpoints(prefix)
 
         # Return the list
         return return_list
@@ -1,10 +1,31 @@
 """ Module that keeps the RESTAPIJSONEncoder class, which seriales
-    a Response to a JSON serializable object. """
+    a Response to a JSON serializable object, and the `dumps` function
+    that uses it to create the JSON for a Response. """
 
+from dataclasses import replace
 from datetime import date, datetime
 from enum import Enum
+from functools import lru_cache
 from json import JSONEncoder
-from typing import Any, Dict, Union
+from operator import attrgetter
+from typing import (Any, Callable, Dict, Iterator, List, Optional, Tuple,
+                    Union)
+
+from sqlalchemy import inspect
+
+# orjson is used to create the compact JSON. If it is not installed,
+# the JSON module from the standard library is used instead.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# MessagePack is optional. If ormsgpack is not installed, the REST API
+# only returns JSON.
+try:
+    import ormsgpack
+except ImportError:
+    ormsgpack = None
 
 from database.database import Database
 from rest_api_generator.response import Response, ResponseType
@@ -13,6 +34,30 @@ from rest_api_generator.response import Response, ResponseType
 class RESTAPIJSONEncoder(JSONEncoder):
     """ Class that can be used to serialize Response objects """
 
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """ The initiator creates the table with the methods to encode
+            specific types. Arguments are passed to the JSONEncoder.
+
+            Parameters
+            ----------
+            *args, **kwargs
+                Arguments for the JSONEncoder.
+
+            Returns
+            -------
+            None
+        """
+        super().__init__(*args, **kwargs)
+
+        # Dict with the exact type of a object and the method to encode
+        # it. Subclasses, like the SQLalchemy models, are added as soon
+        # as we encounter them.
+        self._dispatch: Dict[type, Callable[[Any], Any]] = {
+            Response: self.encode_rest_api_response,
+            datetime: self.encode_datetime,
+            date: self.encode_date
+        }
+
     def default(self, object: Any) -> Union[Dict, int, str]:
         """ The default method of the encoder gets the objects that the
             JSON encoder cannot encode. In this method, we check what
@@ -36,27 +81,80 @@ class RESTAPIJSONEncoder(JSONEncoder):
                 A string that the JSON encoder can use.
         """
 
-        # Check what kind of object we got
-        if isinstance(object, Response):
-            # REST API Responses can be converted to a dict
-            return self.encode_rest_api_response(object=object)
-        elif isinstance(object, ResponseType):
-            # ResponseTypes can be converted to a integer
-            return object.value
-        elif isinstance(object, Database.base_class):
-            # Return the dict for the SQLalchemy object
-            return self.encode_sqlalchemy_object(object=object)
-        elif isinstance(object, datetime):
-            return object.strftime('%Y-%m-%d %H:%M:%S')
-        elif isinstance(object, date):
-            return object.strftime('%Y-%m-%d')
-        elif isinstance(object, Enum):
-            return object.value
-        else:
-            # If we get a object that we can't encode, we raise a
-            # TypeError.
-            raise TypeError(
-                f'Unserializable object "{object}" of type "{type(object)}"')
+        # Find the method for the exact type of the object. Most of the
+        # time, this is all that is needed.
+        object_type = type(object)
+        handler = self._dispatch.get(object_type)
+
+        # If we don't know the type yet, we check what kind of object
+        # we got and save the method for the next object of this type
+        if handler is None:
+            if issubclass(object_type, Response):
+                # REST API Responses can be converted to a dict
+                handler = self.encode_rest_api_response
+            elif issubclass(object_type, Database.base_class):
+                # Return the dict for the SQLalchemy object
+                handler = self.encode_sqlalchemy_object
+            elif issubclass(object_type, datetime):
+                handler = self.encode_datetime
+            elif issubclass(object_type, date):
+                handler = self.encode_date
+            elif issubclass(object_type, Enum):
+                handler = self.encode_enum
+            else:
+                # If we get a object that we can't encode, we raise a
+                # TypeError.
+                raise TypeError(
+                    f'Unserializable object "{object}" of type ' +
+                    f'"{object_type}"')
+            self._dispatch[object_type] = handler
+
+        return handler(object)
+
+    def encode_enum(self, object: Enum) -> Any:
+        """ Method to encode a Enum, like the role of a user.
+
+            Parameters
+            ----------
+            object : Enum
+                The object to encode.
+
+            Returns
+            -------
+            Any
+                The value of the Enum.
+        """
+        return object.value
+
+    def encode_datetime(self, object: datetime) -> str:
+        """ Method to encode a datetime object.
+
+            Parameters
+            ----------
+            object : datetime
+                The object to encode.
+
+            Returns
+            -------
+            str
+                The date and time as string.
+        """
+        return object.isoformat(sep=' ', timespec='seconds')
+
+    def encode_date(self, object: date) -> str:
+        """ Method to encode a date object.
+
+            Parameters
+            ----------
+            object : date
+                The object to encode.
+
+            Returns
+            -------
+            str
+                The date as string.
+        """
+        return object.isoformat()
 
     def encode_rest_api_response(self, object: Response) -> Dict:
         """ Method to encode a Response object.
@@ -72,57 +170,83 @@ class RESTAPIJSONEncoder(JSONEncoder):
                 A dictionary the JSON encoder can encode.
         """
 
-        # Create a default dict that we can fill
-        return_dict: Dict = {
+        # If there was an error, we only return error information
+        if not object.success:
+            return {
+                'type': object.type,
+                'success': object.success,
+                'error_code': object.error_code,
+                'error_message': object.error_message or '',
+                'runtime': object.runtime
+            }
+
+        # Single resources don't have pagination information
+        if object.type is ResponseType.SINGLE_RESOURCE:
+            return {
+                'type': object.type,
+                'success': object.success,
+                'data': object.data,
+                'runtime': object.runtime
+            }
+
+        # Resource sets with SQLalchemy objects are encoded in one go,
+        # so the JSON encoder doesn't have to call 'default' for every
+        # object in the list
+        data = object.data
+        if type(data) is list and data and \
+                isinstance(data[0], Database.base_class):
+            data = self.encode_sqlalchemy_objects(data)
+
+        # Add the data and pagination
+        return {
             'type': object.type,
             'success': object.success,
-            'error_code': 0,
-            'error_message': '',
-            'data': None,
-            'page': 0,
-            'limit': 0,
-            'last_page': 0,
-            'total_items': 0,
-            'runtime': 0.0
+            'data': data,
+            'page': object.page,
+            'limit': object.limit,
+            'last_page': object.last_page,
+            'total_items': object.total_items,
+            'runtime': object.runtime
         }
 
-        # If there was an error, we add error information
-        if not object.success:
-            return_dict['error_code'] = object.error_code
-            if object.error_message:
-                return_dict['error_message'] = object.error_message
-
-            # Remove the unneeded fields
-            return_dict.pop('data')
-            return_dict.pop('page')
-            return_dict.pop('limit')
-            return_dict.pop('last_page')
-            return_dict.pop('total_items')
-        else:
-            # If there wasn't a error, we remove the error fields
-            return_dict.pop('error_code')
-            return_dict.pop('error_message')
-
-            # Add the data and pagination (if specified)
-            return_dict['data'] = object.data
-            if object.type == ResponseType.RESOURCE_SET:
-                return_dict['page'] = object.page
-                return_dict['limit'] = object.limit
-                return_dict['total_items'] = object.total_items
-                return_dict['last_page'] = object.last_page
-            elif object.type == ResponseType.SINGLE_RESOURCE:
-                return_dict.pop('page')
-                return_dict.pop('limit')
-                return_dict.pop('total_items')
-                return_dict.pop('last_page')
-
-        # Add other fields
-        return_dict['runtime'] = round(object.runtime, 3)
-
-        # Return the object
-        return return_dict
-
-    def encode_sqlalchemy_object(self, object: Database.base_class):
+    def encode_sqlalchemy_objects(self, objects: List[Any]) -> List[Any]:
+        """ Method to encode a list of SQLalchemy objects. The columns
+            for the class of the first object are retrieved once
+            instead of for every object in the list.
+
+            Parameters
+            ----------
+            objects : List[Any]
+                A list with objects created from a subclass of
+                Database.base_class.
+
+            Returns
+            -------
+            list
+                A list the JSON encoder can encode.
+        """
+
+        object_type = type(objects[0])
+        schema = _schema_for(object_type)
+
+        # Objects of a different type are encoded on their own, or left
+        # alone for the JSON encoder if they aren't SQLalchemy objects
+        encoded_objects: List[Any] = list()
+        for object in objects:
+            if type(object) is object_type:
+                encoded_objects.append(
+                    self.encode_sqlalchemy_object(object, schema))
+            elif isinstance(object, Database.base_class):
+                encoded_objects.append(self.encode_sqlalchemy_object(object))
+            else:
+                encoded_objects.append(object)
+
+        return encoded_objects
+
+    def encode_sqlalchemy_object(
+            self,
+            object: Database.base_class,
+            schema: Optional[Tuple] = None) -> Dict:
         """ Method to encode a SQLalchemy object.
 
             Parameters
@@ -131,40 +255,292 @@ class RESTAPIJSONEncoder(JSONEncoder):
                 A object created from a subclass of
                 Database.base_class.
 
+            schema : Optional[Tuple] [default=None]
+                The result of `_schema_for` for the class of the
+                object. Is retrieved when it is not given.
+
             Returns
             -------
             dict
                 A dictionary the JSON encoder can encode.
         """
 
-        # Get the fields that we should hide
-        try:
-            fields_to_hide = object.api_hide_fields
-        except AttributeError:
-            fields_to_hide = list()
-
-        # Get the columns
-        columns = [column.name for column in type(object).__table__.columns]
-
-        # Then we create a dict with the only the column items
-        column_dict = {
-            key: value
-            for key, value in object.__dict__.items()
-            if key in columns and key not in fields_to_hide
-        }
+        # Get the columns and extra fields for this class
+        if schema is None:
+            schema = _schema_for(type(object))
+        columns, build_column_dict, api_extra_fields, get_extra_fields = \
+            schema
 
-        # Add fields that are in the 'api_extra_fields' list
+        # Then we create a dict with the only the column items. Columns
+        # that are not loaded are not in the '__dict__' of the object;
+        # in that case, we only add the columns that are loaded.
+        values = object.__dict__
         try:
-            api_extra_fields = object.api_extra_fields
-        except AttributeError:
-            api_extra_fields = list()
+            column_dict = build_column_dict(values)
+        except KeyError:
+            column_dict = {
+                key: values[key]
+                for key in columns
+                if key in values
+            }
 
-        # Loop through the extra fields and add them to the outgoing dict
-        for extra_field in api_extra_fields:
+        # Add fields that are in the 'api_extra_fields' list. The values
+        # are retrieved in one call; if one of the fields doesn't exist,
+        # we retrieve them one by one and use None for missing fields.
+        if api_extra_fields:
             try:
-                column_dict[extra_field] = object.__getattribute__(extra_field)
+                column_dict.update(
+                    zip(api_extra_fields, get_extra_fields(object)))
             except AttributeError:
-                column_dict[extra_field] = None
+                for extra_field in api_extra_fields:
+                    column_dict[extra_field] = getattr(
+                        object, extra_field, None)
 
         # And we return that dict
         return column_dict
+
+
+def _attribute_getter(names: Tuple[str, ...]) -> Callable[[Any], Tuple]:
+    """ Function that creates a function that gets the values for a
+        number of attributes in one call and returns them as a tuple.
+        'attrgetter' returns a single value instead of a tuple when it
+        gets one name, so we wrap it in that case.
+
+        Parameters
+        ----------
+        names : Tuple[str, ...]
+            The names of the attributes to get.
+
+        Returns
+        -------
+        Callable[[Any], Tuple]
+            A function that returns the values for the attributes as a
+            tuple.
+    """
+    if len(names) > 1:
+        return attrgetter(*names)
+
+    if len(names) == 1:
+        get_name = attrgetter(names[0])
+
+        def get_names(value: Any) -> Tuple:
+            return (get_name(value), )
+        return get_names
+
+    def get_no_names(value: Any) -> Tuple:
+        return ()
+    return get_no_names
+
+
+def _dict_builder(keys: Tuple[str, ...]) -> Callable[[Dict], Dict]:
+    """ Function that creates a function that copies the given keys
+        from a dict to a new dict. The function is generated as Python
+        code with a dict literal, so Python can create the dict in one
+        go instead of looping over the keys.
+
+        Parameters
+        ----------
+        keys : Tuple[str, ...]
+            The keys to copy.
+
+        Returns
+        -------
+        Callable[[Dict], Dict]
+            A function that creates the new dict. Raises a KeyError if
+            one of the keys is not in the given dict.
+    """
+    items = ', '.join(f'{key!r}: values[{key!r}]' for key in keys)
+    namespace: Dict[str, Any] = dict()
+    exec(f'def build_dict(values):\n    return {{{items}}}\n', namespace)
+    return namespace['build_dict']
+
+
+@lru_cache(maxsize=None)
+def _schema_for(cls: type) -> Tuple[Tuple[str, ...],
+                                    Callable[[Dict], Dict],
+                                    Tuple[str, ...],
+                                    Callable[[Any], Tuple]]:
+    """ Function that returns the columns that should be serialized for
+        a SQLalchemy class and the extra fields that should be added.
+        The result is cached, so the columns of a class only have to be
+        retrieved once instead of for every serialized object.
+
+        Parameters
+        ----------
+        cls : type
+            A subclass of Database.base_class.
+
+        Returns
+        -------
+        tuple
+            A tuple with the names of the visible columns, a function
+            that creates a dict with these columns from the `__dict__`
+            of a object, a tuple with the names
+            of the extra fields and a function that returns the values
+            of the extra fields from a object as a tuple.
+    """
+
+    # Get the fields that we should hide
+    fields_to_hide = getattr(cls, 'api_hide_fields', ())
+
+    # Get the columns that are not hidden. We use the keys of the
+    # mapper instead of the names in the table; the keys are the names
+    # the values have in the `__dict__` of the objects.
+    columns = tuple(
+        key
+        for key in inspect(cls).columns.keys()
+        if key not in fields_to_hide
+    )
+
+    # Get the fields that are in the 'api_extra_fields' list
+    api_extra_fields = tuple(getattr(cls, 'api_extra_fields', ()))
+
+    return (columns, _dict_builder(columns),
+            api_extra_fields, _attribute_getter(api_extra_fields))
+
+
+# Encoders that are created once and used for every response. The
+# compact encoder is used for the `default` hook of orjson, the pretty
+# encoder creates the indented JSON.
+_encoder = RESTAPIJSONEncoder()
+_pretty_encoder = RESTAPIJSONEncoder(indent=4, sort_keys=True)
+
+# Encoder for the compact JSON when orjson is not installed. It creates
+# the same JSON as orjson: without whitespace and not ASCII-escaped.
+_compact_encoder = RESTAPIJSONEncoder(separators=(',', ':'),
+                                      ensure_ascii=False)
+
+# Options for orjson. Dataclasses (like Response) and datetime objects
+# are passed to the `default` hook, so they are serialized the same way
+# the RESTAPIJSONEncoder does it. Enums are serialized by orjson itself
+# and don't need the hook. The datetime objects can't be serialized by
+# orjson itself, because orjson uses a different format.
+if orjson:
+    _ORJSON_OPTIONS = (orjson.OPT_PASSTHROUGH_DATACLASS |
+                       orjson.OPT_PASSTHROUGH_DATETIME |
+                       orjson.OPT_NON_STR_KEYS)
+
+
+def _dumps_compact(object: Any) -> bytes:
+    """ Function to serialize a object to compact JSON with orjson, or
+        with the standard library if orjson is not installed.
+
+        Parameters
+        ----------
+        object : Any
+            The object to serialize.
+
+        Returns
+        -------
+        bytes
+            The compact JSON.
+    """
+    if orjson:
+        return orjson.dumps(object, default=_encoder.default,
+                            option=_ORJSON_OPTIONS)
+    return _compact_encoder.encode(object).encode('utf-8')
+
+
+def dumps(object: Any, pretty: bool = False) -> Union[bytes, str]:
+    """ Function to serialize a object, like a Response, to JSON. By
+        default, the compact JSON is created by orjson, which is a lot
+        faster than the JSON module from the standard library. Without
+        orjson, the standard library creates the same JSON. Pretty JSON
+        is created with the standard library so the indentation and
+        sorting stays the same.
+
+        Parameters
+        ----------
+        object : Any
+            The object to serialize.
+
+        pretty : bool [default=False]
+            Create pretty JSON (indented and with sorted keys).
+
+        Returns
+        -------
+        bytes
+            The compact JSON.
+
+        str
+            The pretty JSON.
+    """
+    if pretty:
+        return _pretty_encoder.encode(object)
+
+    # A Response is converted to a dict before it is given to orjson,
+    # so orjson doesn't have to call the `default` hook for it
+    if type(object) is Response:
+        object = _encoder.encode_rest_api_response(object)
+
+    return _dumps_compact(object)
+
+
+def dumps_stream(object: Response, chunk_size: int = 500) -> Iterator[bytes]:
+    """ Function to serialize a Response with a list of resources to
+        compact JSON in chunks. The items in the list are encoded
+        `chunk_size` at a time, so the JSON for a large list never has
+        to be in memory at once. The result is the same as the result
+        of `dumps`.
+
+        Parameters
+        ----------
+        object : Response
+            The Response to serialize. The `data` should be a list.
+
+        chunk_size : int [default=500]
+            The number of items to encode per chunk.
+
+        Returns
+        -------
+        Iterator[bytes]
+            A iterator with the chunks of the JSON.
+    """
+
+    # Create the JSON for the Response without data and split it where
+    # the data should be
+    frame = dumps(replace(object, data=[]))
+    head, tail = frame.split(b'"data":[]', 1)
+    yield head + b'"data":['
+
+    # Encode the items in chunks. orjson creates a list for every
+    # chunk; we only need the items, so we remove the brackets.
+    data = object.data
+    for start in range(0, len(data), chunk_size):
+        chunk = data[start:start + chunk_size]
+        if isinstance(chunk[0], Database.base_class):
+            chunk = _encoder.encode_sqlalchemy_objects(chunk)
+        encoded = _dumps_compact(chunk)[1:-1]
+        yield b',' + encoded if start else encoded
+
+    yield b']' + tail
+
+
+def dumps_msgpack(object: Any) -> bytes:
+    """ Function to serialize a object, like a Response, to MessagePack.
+        The same `default` hook as for JSON is used, so the data is the
+        same as the compact JSON. Can only be used when ormsgpack is
+        installed.
+
+        Parameters
+        ----------
+        object : Any
+            The object to serialize.
+
+        Returns
+        -------
+        bytes
+            The MessagePack data.
+    """
+    if type(object) is Response:
+        object = _encoder.encode_rest_api_response(object)
+
+    return ormsgpack.packb(object, default=_encoder.default,
+                           option=_MSGPACK_OPTIONS)
+
+
+# Options for ormsgpack. These are the same as the options for orjson.
+if ormsgpack:
+    _MSGPACK_OPTIONS = (ormsgpack.OPT_PASSTHROUGH_DATACLASS |
+                        ormsgpack.OPT_PASSTHROUGH_DATETIME |
+                        ormsgpack.OPT_NON_STR_KEYS)
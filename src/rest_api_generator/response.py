@@ -2,12 +2,13 @@
 """
 
 from dataclasses import dataclass
-from enum import Enum
+from enum import IntEnum
 from typing import Any, Optional
 
 
-class ResponseType(Enum):
-    """ Enum that dictates the type of API response.
+class ResponseType(IntEnum):
+    """ Enum that dictates the type of API response. This is a IntEnum,
+        so the JSON encoders can encode it as a integer.
 
         Constants
         ---------
@@ -27,7 +28,7 @@ class ResponseType(Enum):
     SINGLE_RESOURCE = 3
 
 
-@dataclass
+@dataclass(slots=True)
 class Response:
     """ Class that represent a API response
 
@@ -56,6 +57,12 @@ class Response:
         page : int [default=0]
             The pagenumber the user is on.
 
+        total_items : int [default=0]
+            The total number of items for the resource. Is set by the
+            API generator for data with a length. Endpoints that return
+            a iterator (like a database cursor) can set it themselves,
+            so the data can be paginated without reading all items.
+
         limit : int [default=0]
             The maximum number of items on one page.
 
@@ -63,7 +70,8 @@ class Response:
             The maximum page for the resource.
 
         runtime : float [default=0]
-            The amount of miliseconds the endpoint has run.
+            The amount of miliseconds the endpoint has run. The
+            RESTAPIGenerator rounds this to three decimals.
     """
 
     # Mandatory members
@@ -2,32 +2,78 @@
     generate the REST API blueprint. """
 
 import re
-import timeit
+from asyncio import run
+from collections import OrderedDict
 from dataclasses import dataclass
-from json import dumps
+from functools import lru_cache
+from hashlib import blake2b
+from itertools import islice
 from logging import getLogger
-from math import ceil
-from typing import Callable, Dict, List, Optional, Set, Tuple, Union
+from threading import Lock
+from time import monotonic, perf_counter_ns
+from typing import (Any, Callable, Dict, FrozenSet, List, Optional, Set,
+                    Tuple, Type, Union)
 
 from flask import Blueprint
+from flask.blueprints import BlueprintSetupState
 from flask import Response as FlaskResponse
-from flask import abort, request
+from flask import abort, request, stream_with_context
+from sqlalchemy.orm import Query
 
 from rest_api_generator.authorization import Authorization
 from rest_api_generator.endpoint import Endpoint
 from rest_api_generator.endpoint_url import EndpointURL
-from rest_api_generator.exceptions import (InvalidGroupError,
+from rest_api_generator.exceptions import (BlueprintRegisteredError,
+                                           InvalidGroupError,
                                            InvalidInputError,
                                            ResourceForbiddenError,
                                            ResourceIntegrityError,
                                            ResourceNotFoundError, ServerError,
-                                           UnauthorizedForResourceError)
+                                           UnauthorizedForResourceError,
+                                           URLNotFoundError)
 from rest_api_generator.group import Group
-from rest_api_generator.json_encoder import RESTAPIJSONEncoder
+from rest_api_generator.json_encoder import (dumps, dumps_msgpack,
+                                             dumps_stream, ormsgpack)
 from rest_api_generator.response import Response, ResponseType
+from rest_api_generator.routing import (Matcher, create_dispatcher,
+                                        split_routes)
+
+# The HTTP error codes for the exceptions that endpoints can raise
+_ENDPOINT_ERROR_CODES: Dict[Type[Exception], int] = {
+    InvalidInputError: 400,
+    UnauthorizedForResourceError: 401,
+    ResourceForbiddenError: 403,
+    ResourceNotFoundError: 404,
+    ServerError: 500,
+    ResourceIntegrityError: 500
+}
+_ENDPOINT_ERRORS = tuple(_ENDPOINT_ERROR_CODES)
+
+
+def _endpoint_error_code(exception: Exception) -> int:
+    """ Function to get the HTTP error code for a exception that was
+        raised by a endpoint. Subclasses of the exceptions get the code
+        of the exception they are derived from.
+
+        Parameters
+        ----------
+        exception : Exception
+            The exception that was raised. Should be a instance of one
+            of the _ENDPOINT_ERRORS.
+
+        Returns
+        -------
+        int
+            The HTTP error code.
+    """
+    for exception_type in type(exception).__mro__:
+        code = _ENDPOINT_ERROR_CODES.get(exception_type)
+        if code:
+            return code
+    return 500
 
 
-@dataclass
+@dataclass(slots=True)
 class BasicAuthorization:
     """
         DataClass for BasicAuthorization. Created for the authorization
@@ -47,7 +93,7 @@ class BasicAuthorization:
     password: str
 
 
-@dataclass
+@dataclass(slots=True)
 class BearerAuthorzation:
     """
         DataClass for BearerAuthorization. Created for the
@@ -93,13 +139,29 @@ class RESTAPIGenerator:
         self.logger = getLogger(f'API_Generator_{bp_name}')
         self.logger.debug('Created')
 
-        # Create a empty set with registered groups. The user can add
-        # groups with the 'register_group' command. We make this a set
-        # to make sure no groups are added more then once.
-        self.groups: Set[Group] = set()
-
-        # Create a dictionary that will contain the cache for the URLs.
-        self.url_cache: Dict[str, Tuple] = dict()
+        # Create a empty dict with registered groups. The user can add
+        # groups with the 'register_group' command. We use the keys of
+        # the dict as a ordered set, to make sure no groups are added
+        # more then once and the endpoints are always matched in the
+        # order the groups were registered.
+        self.groups: Dict[Group, None] = dict()
+
+        # Create a cache for the endpoints of the URLs. The cache is
+        # bounded, so requests for a lot of different URLs can't fill
+        # the memory. Paths without a endpoint raise a exception in the
+        # cached method, so they are not cached and can't push the
+        # endpoints out of the cache.
+        self.url_cache = lru_cache(maxsize=4096)(self.resolve_known_url)
+
+        # The routing tables are created when the first request comes
+        # in and are reset when a group is registered. URLs without
+        # regex characters are put in a dict so they can be found
+        # without matching regexes. The URLs with regexes are put in a
+        # trie, so only the regexes for URLs that start with the same
+        # segments as the path have to be matched.
+        self._static_endpoints: Optional[Dict[str, EndpointURL]] = None
+        self._regex_endpoints: Optional[List[EndpointURL]] = None
+        self._dispatcher: Optional[Matcher] = None
 
         # Create a Flask Blueprint. This can be used to connect the
         # REST API to a existing Flask app
@@ -109,12 +171,15 @@ class RESTAPIGenerator:
             url_prefix=bp_url_prefix
         )
 
-        # Create a list with acceptable HTTP methods. By default, we
+        # Create a set with acceptable HTTP methods. By default, we
         # only accept 'GET' requests, but the user can add methods to
-        # accept with the 'add_method' method.
-        self.accepted_http_methods = [
-            'GET'
-        ]
+        # accept with the 'accept_method' method. The set is given to
+        # the Flask routes and read when the Blueprint is registered in
+        # the Flask app, so methods have to be added before that. After
+        # the Blueprint is registered, changing the methods raises a
+        # exception.
+        self.accepted_http_methods: Set[str] = {'GET'}
+        self._blueprint_registered: bool = False
 
         # Set default values for the authorization options
         self.use_authorization: bool = False
@@ -122,22 +187,83 @@ class RESTAPIGenerator:
             Callable[
                 [
                     Optional[Union[BasicAuthorization, BearerAuthorzation]],
-                    Optional[List[str]]
+                    Optional[FrozenSet[str]]
                 ],
                 Authorization
             ]
         ]
 
+        # Create a cache for the results of the authorization function.
+        # The cache is disabled by default. To enable it, set
+        # 'auth_cache_ttl' to the number of seconds a result can be
+        # reused. Results are cached per Authorization header and
+        # scopes, so a revoked token can be used until the result
+        # expires or 'invalidate_auth_cache' is called. Only the
+        # decision is cached; the 'data' of the Authorization object
+        # can be tied to a database session or a thread, so it is not
+        # shared between requests. When the cache is used, the data is
+        # created for every request with 'authorization_data_function',
+        # if it is set. Otherwise, the data is None.
+        self.auth_cache_ttl: float = 0
+        self.auth_cache = lru_cache(maxsize=2048)(self.authorize_decision)
+        self.authorization_data_function: Optional[
+            Callable[
+                [Optional[Union[BasicAuthorization, BearerAuthorzation]]],
+                Any
+            ]
+        ] = None
+
+        # Create a cache for the responses of endpoints that are marked
+        # as 'cacheable'. The cache is bounded; when it is full, the
+        # least recently used response is removed. Responses expire
+        # after the 'cache_ttl' of the endpoint, if it is set. The
+        # cache is changed on lookups too, so it is guarded by a lock
+        # for servers that handle requests in threads.
+        self.response_cache_size: int = 1024
+        self._response_cache: OrderedDict[
+            Tuple, Tuple[int, bytes, float]] = OrderedDict()
+        self._response_cache_lock = Lock()
+
+        # Create the JSON for the errors that always have the same
+        # message once. The runtime is the last field; it is added for
+        # every request.
+        self._error_json: Dict[Tuple[int, Optional[str]], bytes] = dict()
+        for error_code, error_message in ((403, None),
+                                          (404, 'Endpoint not found'),
+                                          (500, 'Unknown error')):
+            error_response = Response(
+                ResponseType.ERROR,
+                success=False,
+                error_code=error_code,
+                error_message=error_message)
+            self._error_json[(error_code, error_message)] = dumps(
+                error_response).rsplit(b'"runtime":', 1)[0] + b'"runtime":'
+
         # Set defaults for API results
         self.default_limit: int = 25
         self.default_pretty: bool = False
         self.abort_on_error: bool = False
 
+        # Add a ETag to successful compact JSON responses for GET
+        # requests. Clients that send the ETag in 'If-None-Match' get a
+        # '304 Not Modified' response without body.
+        self.use_etags: bool = True
+
+        # Lists of resources with more items than this are streamed to
+        # the client
+        self.stream_threshold: int = 1000
+
+        # The mimetypes the API can return. The first one is used when
+        # the client accepts all mimetypes.
+        self.response_mimetypes: List[str] = [
+            'application/json', 'application/msgpack']
+
         # Register the routes
         self.add_routes()
 
     def accept_method(self, method: str) -> None:
-        """ Method to add HTTP methods to the accepted list
+        """ Method to add HTTP methods to the accepted set. Should be
+            called before the Blueprint is registered in the Flask app.
 
             Parameters
             ----------
@@ -148,11 +274,14 @@ class RESTAPIGenerator:
             -------
             None
         """
+        self._check_blueprint_not_registered()
         self.logger.debug(f'Adding method: {method}')
-        self.accepted_http_methods.append(method)
+        self.accepted_http_methods.add(method)
 
     def deny_method(self, method: str) -> None:
-        """ Method to remove HTTP methods from the accepted list.
+        """ Method to remove HTTP methods from the accepted set. Should
+            be called before the Blueprint is registered in the Flask
+            app.
 
             Parameters
             ----------
@@ -163,15 +292,305 @@ class RESTAPIGenerator:
             -------
             None
         """
+        self._check_blueprint_not_registered()
 
         try:
             self.logger.debug(f'Removing method: {method}')
             self.accepted_http_methods.remove(method)
-        except ValueError:
-            # If the item wasn't in the list, we get an ValueError
+        except KeyError:
+            # If the item wasn't in the set, we get an KeyError
             # exception. We don't do anything in that case.
             self.logger.debug(f'Method not removed; not in the list')
 
+    def _check_blueprint_not_registered(self) -> None:
+        """ Method that raises a exception when the Blueprint is
+            registered in a Flask app already.
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            None
+        """
+        if self._blueprint_registered:
+            raise BlueprintRegisteredError(
+                'The accepted HTTP methods can\'t be changed after the ' +
+                'Blueprint is registered')
+
+    def _set_blueprint_registered(self, state: BlueprintSetupState) -> None:
+        """ Method that is called when the Blueprint is registered in a
+            Flask app for the first time.
+
+            Parameters
+            ----------
+            state : BlueprintSetupState
+                The state of the registration.
+
+            Returns
+            -------
+            None
+        """
+        self._blueprint_registered = True
+
+    def authorize(self,
+                  authorization_header: str,
+                  scopes: Optional[FrozenSet[str]]) -> Authorization:
+        """ Method that creates the authorization object for the given
+            Authorization header and runs the authorization function
+            with it.
+
+            Parameters
+            ----------
+            authorization_header : str
+                The Authorization header of the request.
+
+            scopes : Optional[FrozenSet[str]]
+                The scopes for the endpoint.
+
+            Returns
+            -------
+            Authorization
+                The result of the authorization function.
+        """
+        return self.authorization_function(
+            self.parse_authorization_header(authorization_header), scopes)
+
+    def authorize_decision(self,
+                           authorization_header: str,
+                           scopes: Optional[FrozenSet[str]],
+                           time_bucket: int = 0) -> bool:
+        """ Method that runs the authorization function and returns if
+            the request is authorized. The results of this method are
+            cached in `auth_cache`.
+
+            Parameters
+            ----------
+            authorization_header : str
+                The Authorization header of the request.
+
+            scopes : Optional[FrozenSet[str]]
+                The scopes for the endpoint.
+
+            time_bucket : int [default=0]
+                Only used for the cache. Results are cached per time
+                bucket, so they expire when the bucket changes.
+
+            Returns
+            -------
+            bool
+                True if the request is authorized, False if it is not.
+        """
+        return bool(self.authorize(authorization_header, scopes).authorized)
+
+    def parse_authorization_header(
+            self, authorization_header: str) -> Optional[
+                Union[BasicAuthorization, BearerAuthorzation]]:
+        """ Method that creates the authorization object for the given
+            Authorization header.
+
+            Parameters
+            ----------
+            authorization_header : str
+                The Authorization header of the request.
+
+            Returns
+            -------
+            BasicAuthorization
+                For 'Basic' authorization.
+
+            BearerAuthorzation
+                For 'Bearer' authorization.
+
+            None
+                For other or malformed headers.
+        """
+        # Split the header in the scheme and the credentials
+        scheme, separator, credentials = authorization_header.partition(' ')
+
+        if separator and scheme == 'Basic':
+            # Basic authorization. The header is parsed by Werkzeug; we do
+            # that once.
+            basic_authorization = request.authorization
+            return BasicAuthorization(
+                username=basic_authorization.username,
+                password=basic_authorization.password
+            )
+
+        if separator and scheme == 'Bearer':
+            # Bearer authorization (a token)
+            return BearerAuthorzation(token=credentials)
+
+        return None
+
+    def invalidate_auth_cache(self) -> None:
+        """ Method to clear the cache with authorization results. Should
+            be called when credentials are changed or revoked.
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            None
+        """
+        self.logger.debug('Clearing the authorization cache')
+        self.auth_cache.cache_clear()
+
+    def get_cached_response(self,
+                            cache_key: Tuple) -> Optional[Tuple[int, bytes]]:
+        """ Method to get a response from the response cache.
+
+            Parameters
+            ----------
+            cache_key : Tuple
+                The key for the response.
+
+            Returns
+            -------
+            tuple[int, bytes]
+                The HTTP status and the JSON for the response, up to
+                the value of the runtime.
+
+            None
+                The response is not in the cache or is expired.
+        """
+        with self._response_cache_lock:
+            cached_response = self._response_cache.get(cache_key)
+            if cached_response:
+                response_code, body, expires = cached_response
+
+                # Remove the response if it is expired
+                if expires and monotonic() >= expires:
+                    del self._response_cache[cache_key]
+                    return None
+
+                self._response_cache.move_to_end(cache_key)
+                return response_code, body
+            return None
+
+    def cache_response(self,
+                       cache_key: Tuple,
+                       response_code: int,
+                       body: bytes,
+                       ttl: float = 0) -> None:
+        """ Method to add a response to the response cache. The runtime
+            is the last field in the JSON; it is removed, so the runtime
+            for the request that gets the cached response can be added.
+            When the cache is full, the least recently used response is
+            removed.
+
+            Parameters
+            ----------
+            cache_key : Tuple
+                The key for the response.
+
+            response_code : int
+                The HTTP status for the response.
+
+            body : bytes
+                The compact JSON for the response.
+
+            ttl : float [default=0]
+                The number of seconds the response can be used. With 0,
+                the response doesn't expire.
+
+            Returns
+            -------
+            None
+        """
+        if self.response_cache_size <= 0:
+            return
+
+        cached_response = (
+            response_code,
+            body.rsplit(b'"runtime":', 1)[0] + b'"runtime":',
+            monotonic() + ttl if ttl > 0 else 0)
+
+        with self._response_cache_lock:
+            self._response_cache[cache_key] = cached_response
+            self._response_cache.move_to_end(cache_key)
+            while len(self._response_cache) > self.response_cache_size:
+                self._response_cache.popitem(last=False)
+
+    def invalidate_response_cache(self) -> None:
+        """ Method to clear the response cache. Should be called when
+            the data of cacheable endpoints is changed.
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            None
+        """
+        self.logger.debug('Clearing the response cache')
+        with self._response_cache_lock:
+            self._response_cache.clear()
+
+    def create_etag(self, body: bytes) -> str:
+        """ Method to create the ETag for a compact JSON response. The
+            runtime is the last field in the JSON and is different for
+            every request, so it is not used for the ETag.
+
+            Parameters
+            ----------
+            body : bytes
+                The compact JSON for the response.
+
+            Returns
+            -------
+            str
+                The ETag for the response.
+        """
+        json_prefix = body.rsplit(b'"runtime":', 1)[0]
+        return blake2b(json_prefix, digest_size=16).hexdigest()
+
+    def json_response(self,
+                      body: Union[bytes, str],
+                      response_code: int,
+                      conditional: bool = False) -> FlaskResponse:
+        """ Method to create the Flask response for JSON. For
+            conditional responses, a ETag is added. If the client
+            already has the response with that ETag, a '304 Not
+            Modified' response is returned instead.
+
+            Parameters
+            ----------
+            body : Union[bytes, str]
+                The JSON for the response. Conditional responses should
+                have compact JSON, as bytes.
+
+            response_code : int
+                The HTTP status for the response.
+
+            conditional : bool [default=False]
+                Specifies if a ETag can be added. Should only be set for
+                compact JSON responses for GET requests.
+
+            Returns
+            -------
+            FlaskResponse
+                The response for the client.
+        """
+        if conditional and self.use_etags and response_code == 200:
+            etag = self.create_etag(body)
+            if request.if_none_match.contains(etag):
+                response = FlaskResponse(status=304)
+            else:
+                response = FlaskResponse(response=body,
+                                         status=response_code,
+                                         mimetype='application/json')
+            response.set_etag(etag)
+            return response
+
+        return FlaskResponse(response=body,
+                             status=response_code,
+                             mimetype='application/json')
+
     def raise_error(self,
                     code: int,
                     msg: Optional[str] = None
@@ -200,15 +619,15 @@ class RESTAPIGenerator:
         # with the given parameter
         if self.abort_on_error:
             self.logger.debug(
-                f'Aborting the request because we got a {code} error with\
-                     message: {msg}')
+                'Aborting the request because we got a %s error with '
+                'message: %s', code, msg)
             abort(code)
 
         # Otherwise, we create a Response that we can return
         if not self.abort_on_error:
             self.logger.debug(
-                f'Aborting the request because we got a {code} error with \
-                    message: {msg}. Generating API error response.')
+                'Aborting the request because we got a %s error with '
+                'message: %s. Generating API error response.', code, msg)
 
             error_response = Response(ResponseType.ERROR)
             error_response.error_code = code
@@ -230,288 +649,389 @@ class RESTAPIGenerator:
 
         self.logger.info('Adding Flask routes')
 
-        # We create a callback method for the Blueprint and make sure
-        # the Flask routing redirects every request to this method.
-        @ self.blueprint.route('/', defaults={'path': ''},
-                               methods=self.accepted_http_methods)
-        @ self.blueprint.route('/<path:path>',
-                               methods=self.accepted_http_methods)
-        def execute_url(path: str) -> Optional[Union[str, FlaskResponse]]:
-            """ Method that gets run as soon as a REST API Endpoint
-                gets requested.
-
-                Parameter
-                ---------
-                path : str
-                    The path the user requested
-
-                Returns
-                -------
-                str
-                    The requested API end result
-            """
-            # Get the starttime
-            time_start = timeit.default_timer()
-
-            self.logger.debug('Searching for endpoints')
-            selected_endpoint: Optional[Endpoint] = None
-            endpoint_regex: Optional[re.Match] = None
-
-            # Search the local URL cache for this URL. By doing so, we
-            # might get the URL without matching the regexes. This
-            # results in a bit more speed.
-            if path in self.url_cache.keys():
-                self.logger.debug('Endpoint was in cache')
-                selected_endpoint, endpoint_regex = self.url_cache[path]
-            else:
-                self.logger.debug('Endpoint was NOT in cache')
-
-                # Get a list of all endpoints registered in this REST API
-                url_list: List[EndpointURL] = self.get_all_endpoints()
-
-                # Filter the list to only include the URL that we need
-                filtered_url_list: List[Tuple] = [
-                    (endpoint, re.fullmatch(endpoint.url, path))
-                    for endpoint in url_list
-                    if re.fullmatch(endpoint.url, path)
-                ]
-
-                # Check if we got a value
-                if len(filtered_url_list) == 1:
-                    selected_endpoint = filtered_url_list[0][0].endpoint
-                    endpoint_regex = filtered_url_list[0][1]
-
-                    # Add it to the cache
-                    self.url_cache[path] = (
-                        selected_endpoint,
-                        endpoint_regex
-                    )
-
-            # Set JSON options
-            json_options = dict()
-
-            # Add 'pretty' JSON results, if the user requested it
-            pretty: bool = self.default_pretty
-            if 'pretty' in request.args.keys():
-                pretty = True
-
-            if pretty:
-                json_options = {
-                    'indent': 4,
-                    'sort_keys': True
-                }
-
-            # Set empty return value
-            return_value: Optional[Response] = None
-
-            # Loop through the endpoints and find one that matches the
-            # requested url
-            if selected_endpoint:
-                self.logger.debug(f'Endpoint found: {selected_endpoint.name}')
-
-                # First we check if the HTTP method is valid for this
-                # endpoint
-                if request.method in selected_endpoint.http_methods:
-                    # Set empty auth variable
-                    auth: Optional[Authorization] = None
-                    error_return: Optional[Response] = None
-
-                    # Method is allowed, check if permissions are
-                    # needed
-                    if selected_endpoint.auth_needed and self.authorization_function:
-                        self.logger.debug(f'Authorization is needed')
-
-                        # Permissions needed, get if the user is
-                        # authorized to run this endpoint
-                        try:
-                            # Check the kind of authorization we
-                            # received and create a good object for it.
-                            authorization_header: str = \
-                                request.headers['Authorization']
-                            authorization_object: Optional[
-                                Union[
-                                    BasicAuthorization,
-                                    BearerAuthorzation
-                                ]
-                            ] = None
-
-                            if authorization_header.startswith('Basic '):
-                                # Basic authorization
-                                authorization_object = BasicAuthorization(
-                                    username=request.authorization['username'],
-                                    password=request.authorization['password']
-                                )
-                            elif authorization_header.startswith('Bearer '):
-                                # Bearer authorization (a token)
-                                authorization_object = BearerAuthorzation(
-                                    token=authorization_header[7:]
-                                )
-
-                            # Check if the user is authorized
-                            auth = \
-                                self.authorization_function(
-                                    authorization_object,
-                                    selected_endpoint.auth_scopes.__getattribute__(
-                                        request.method)
-                                )
-                        except (AttributeError, KeyError):
-                            auth = Authorization(authorized=False)
-
-                        self.logger.debug(
-                            f'Authorized return: {auth.authorized}')
-
-                        # Check the given value. If the user is not
-                        # authorized, we raise a 403 error
-                        if not auth.authorized:
-                            error = self.raise_error(403)
-                            if error:
-                                error_return = error
-                            else:
-                                return None
-
-                    # Get the variables given in the URL (if any are
-                    # given).
-
-                    self.logger.debug(f'Paginating')
-
-                    page: int = 1
-                    limit: int = self.default_limit
-
-                    if 'page' in request.args.keys():
-                        page = int(request.args['page'])
-                    if 'limit' in request.args.keys():
-                        limit = int(request.args['limit'])
-
-                    # Done! Run the endpoint method
+        # We register the 'execute_url' method as the view function for
+        # the Blueprint and make sure the Flask routing redirects every
+        # request to this method.
+        self.blueprint.add_url_rule('/', 'execute_url', self.execute_url,
+                                    defaults={'path': ''},
+                                    methods=self.accepted_http_methods)
+        self.blueprint.add_url_rule('/<path:path>', 'execute_url',
+                                    self.execute_url,
+                                    methods=self.accepted_http_methods)
+
+        # The responses depend on the 'Accept' header of the request,
+        # so caches have to know that
+        self.blueprint.after_request(self.add_vary_header)
+
+        # Remember when the Blueprint is registered, so the accepted
+        # HTTP methods can't be changed after that
+        self.blueprint.record_once(self._set_blueprint_registered)
+
+    def add_vary_header(self, response: FlaskResponse) -> FlaskResponse:
+        """ Method that adds 'Accept' to the 'Vary' header of the
+            responses of the Blueprint when MessagePack is available.
+            The same URL can then return JSON or MessagePack, depending
+            on the 'Accept' header, so HTTP caches should keep the
+            responses apart. Is also done for responses for errors and
+            '304 Not Modified' responses.
+
+            Parameters
+            ----------
+            response : FlaskResponse
+                The response for the request.
+
+            Returns
+            -------
+            FlaskResponse
+                The response with the 'Vary' header.
+        """
+        if ormsgpack and 'application/msgpack' in self.response_mimetypes:
+            response.vary.add('Accept')
+        return response
+
+    def execute_url(self,
+                    path: str) -> Optional[Union[str, FlaskResponse]]:
+        """ Method that gets run as soon as a REST API Endpoint
+            gets requested. Is registered as the view function for all
+            routes of the Blueprint.
+
+            Parameter
+            ---------
+            path : str
+                The path the user requested
+
+            Returns
+            -------
+            str
+                The requested API end result
+        """
+        # Get the starttime
+        time_start = perf_counter_ns()
+
+        self.logger.debug('Searching for endpoints')
+        selected_endpoint: Optional[Endpoint] = None
+        endpoint_regex: Optional[re.Match] = None
+
+        # Search the URL cache for this URL. By doing so, we might
+        # get the URL without matching the regexes. This results in
+        # a bit more speed.
+        try:
+            selected_endpoint, endpoint_regex = self.url_cache(path)
+        except URLNotFoundError:
+            pass
+
+        # Get the arguments and method for the request once
+        args = request.args
+        method: str = request.method
+
+        # Add 'pretty' JSON results, if the user requested it
+        pretty: bool = self.default_pretty or 'pretty' in args
+
+        # Check if the client prefers MessagePack and ormsgpack is
+        # installed
+        use_msgpack: bool = bool(ormsgpack) and \
+            request.accept_mimetypes.best_match(
+                self.response_mimetypes) == 'application/msgpack'
+
+        # The key for the response cache. Only set when the response
+        # for this request can be cached.
+        cache_key: Optional[Tuple] = None
+
+        # The JSON for errors with a fixed message, up to the runtime.
+        # Only set when the request results in one of these errors.
+        error_json: Optional[bytes] = None
+
+        # Set empty return value
+        return_value: Optional[Response] = None
+
+        # Loop through the endpoints and find one that matches the
+        # requested url
+        if selected_endpoint:
+            self.logger.debug('Endpoint found: %s', selected_endpoint.name)
+
+            # First we check if the HTTP method is valid for this
+            # endpoint
+            if method in selected_endpoint.http_methods:
+                # Set empty auth variable
+                auth: Optional[Authorization] = None
+                error_return: Optional[Response] = None
+
+                # Method is allowed, check if permissions are
+                # needed
+                if selected_endpoint.auth_needed and self.authorization_function:
+                    self.logger.debug('Authorization is needed')
+
+                    # Permissions needed, get if the user is
+                    # authorized to run this endpoint
                     try:
-                        if error_return:
-                            return_value = error_return
-                        else:
-                            return_value = selected_endpoint.func(
-                                auth,
-                                endpoint_regex
-                            )
-                    except InvalidInputError as exception:
-                        # User gave wrong input, raise a 400-error
-                        error = self.raise_error(400, str(exception))
-                        if error:
-                            return_value = error
+                        # Get the header and the scopes for this
+                        # method. If the endpoint has no scopes for
+                        # this method, we get a KeyError and the
+                        # user is not authorized.
+                        authorization_header: str = \
+                            request.headers['Authorization']
+                        scopes = selected_endpoint.scopes_by_method[
+                            method]
+
+                        # Check if the user is authorized. If the
+                        # auth cache is enabled, we use the cache for
+                        # the decision and create the data for this
+                        # request.
+                        if self.auth_cache_ttl > 0:
+                            auth = Authorization(
+                                authorized=self.auth_cache(
+                                    authorization_header,
+                                    scopes,
+                                    int(monotonic() / self.auth_cache_ttl)))
+                            if auth.authorized and \
+                                    self.authorization_data_function:
+                                auth.data = self.authorization_data_function(
+                                    self.parse_authorization_header(
+                                        authorization_header))
                         else:
-                            return None
-                    except UnauthorizedForResourceError as exception:
-                        # User is not authorized, raise a 401-error
-                        error = self.raise_error(401, str(exception))
+                            auth = self.authorize(
+                                authorization_header, scopes)
+                    except (AttributeError, KeyError):
+                        auth = Authorization(authorized=False)
+
+                    self.logger.debug(
+                        'Authorized return: %s', auth.authorized)
+
+                    # Check the given value. If the user is not
+                    # authorized, we raise a 403 error
+                    if not auth.authorized:
+                        error = self.raise_error(403)
                         if error:
-                            return_value = error
-                        else:
-                            return None
-                    except ResourceForbiddenError as exception:
-                        # User is not authorized, raise a 403-error
-                        error = self.raise_error(403, str(exception))
-                        if error:
-                            return_value = error
-                        else:
-                            return None
-                    except ResourceNotFoundError as exception:
-                        # User is not authorized, raise a 404-error
-                        error = self.raise_error(404, str(exception))
-                        if error:
-                            return_value = error
-                        else:
-                            return None
-                    except (ServerError, ResourceIntegrityError) as exception:
-                        # A server error occured; raise a 500-error
-                        error = self.raise_error(500, str(exception))
-                        if error:
-                            return_value = error
-                        else:
-                            return None
-                    except Exception as exception:
-                        # All other errors will be reported as unknown error to
-                        # the user, but we will log the real error
-                        self.logger.error(
-                            f'Error: "{exception}" on path "{path}"')
-                        self.logger.error(f'Given data: \'{request.data}\'')
-                        error = self.raise_error(500, 'Unknown error')
-                        if error:
-                            return_value = error
+                            error_return = error
+                            error_json = self._error_json[(403, None)]
                         else:
                             return None
 
-                    # Paginate the result (if requested)
-                    if return_value.paginate and \
-                            return_value.type == \
-                            ResponseType.RESOURCE_SET and \
-                            hasattr(return_value.data, '__len__'):
-
-                        # Set the total items, limit and the page
-                        return_value.limit = limit
-                        return_value.page = page
-                        return_value.total_items = return_value.data.__len__()
-
-                        # Calculate the max page
-                        return_value.last_page = ceil(
-                            return_value.total_items / limit)
-
-                        # Check if the page is correct, and if it
-                        # isn't, fix it
-                        if return_value.page > return_value.last_page:
-                            return_value.page = return_value.last_page
-                        elif return_value.page < 1:
-                            return_value.page = 1
-
-                        # Calculate the start and end index for the
-                        # results
-                        start = (return_value.page - 1) * limit
-                        end = start + limit
-
-                        # Filter the data
-                        return_value.data = return_value.data[start:end]
-                else:
-                    # No matching URL found for this HTTP method. We abort the
-                    # request with a 404 error
-                    supported_method_list = ', '.join([
-                        f'"{method}"' for method in selected_endpoint.http_methods])
-                    self.logger.error(
-                        f'Not a valid method for this endpoint! Given method: "{request.method}", supported methods: {supported_method_list}')
+                # Get the variables given in the URL (if any are
+                # given).
+
+                self.logger.debug('Paginating')
+
+                # Werkzeug returns the default when a value can't be
+                # converted, so malformed values don't raise a
+                # ValueError. A limit of 0 falls back to the default.
+                page: int = args.get('page', 1, type=int)
+                limit: int = args.get('limit', self.default_limit,
+                                      type=int) or self.default_limit
+
+                # Check if the response for this request is
+                # cached. Only compact JSON responses for GET
+                # requests are cached.
+                if selected_endpoint.cacheable and method == 'GET' \
+                        and not pretty and not use_msgpack \
+                        and not error_return:
+                    cache_key = (
+                        path,
+                        tuple(sorted(args.items(multi=True))),
+                        request.headers.get('Authorization'))
+                    cached_response = self.get_cached_response(
+                        cache_key)
+                    if cached_response:
+                        self.logger.debug('Response was in cache')
+                        response_code, body = cached_response
+                        runtime = round(
+                            (perf_counter_ns() - time_start) / 1_000_000, 3)
+                        return self.json_response(
+                            body + dumps(runtime) + b'}',
+                            response_code,
+                            conditional=True)
+
+                # Done! Run the endpoint method
+                try:
+                    if error_return:
+                        return_value = error_return
+                    else:
+                        return_value = selected_endpoint.func(
+                            auth,
+                            endpoint_regex
+                        )
+
+                        # Endpoints that are coroutine functions are
+                        # run in a event loop, so they can wait for
+                        # more things at the same time
+                        if selected_endpoint.is_coroutine:
+                            return_value = run(return_value)
+                except _ENDPOINT_ERRORS as exception:
+                    # The endpoint raised a error for the user; raise the
+                    # HTTP error for it
                     error = self.raise_error(
-                        405, f'Not a valid method for this endpoint! Given method: "{request.method}", supported methods: {supported_method_list}')
+                        _endpoint_error_code(exception), str(exception))
                     if error:
                         return_value = error
                     else:
                         return None
+                except Exception as exception:
+                    # All other errors will be reported as unknown error to
+                    # the user, but we will log the real error
+                    self.logger.error(
+                        'Error: "%s" on path "%s"', exception, path)
+                    self.logger.error('Given data: \'%s\'', request.data)
+                    error = self.raise_error(500, 'Unknown error')
+                    if error:
+                        return_value = error
+                        error_json = self._error_json[(500, 'Unknown error')]
+                    else:
+                        return None
 
+                # Check if the endpoint returned a Response. If it
+                # didn't, it is a error in the endpoint and we
+                # report it as a unknown error.
+                if not isinstance(return_value, Response):
+                    self.logger.error(
+                        'Endpoint for path "%s" returned "%s" instead of '
+                        'a Response', path, type(return_value))
+                    error = self.raise_error(500, 'Unknown error')
+                    if error:
+                        return_value = error
+                        error_json = self._error_json[(500, 'Unknown error')]
+                    else:
+                        return None
+
+                # Get the number of items for the pagination (if
+                # requested). SQLalchemy queries are counted by the
+                # database and sliced with LIMIT and OFFSET, so only
+                # the items for the page are retrieved. Other data
+                # without a length is only paginated if the
+                # endpoint set the total number of items itself.
+                total_items: Optional[int] = None
+                sized: bool = True
+                if return_value.paginate and \
+                        return_value.type is ResponseType.RESOURCE_SET:
+                    try:
+                        total_items = len(return_value.data)
+                    except TypeError:
+                        if isinstance(return_value.data, Query):
+                            total_items = return_value.data.count()
+                        elif return_value.total_items and \
+                                hasattr(return_value.data, '__iter__'):
+                            total_items = return_value.total_items
+                            sized = False
+
+                # Paginate the result
+                if total_items is not None:
+                    # Calculate the max page and make sure the page
+                    # is between 1 and the max page. Without items,
+                    # the max page is 0 and so is the page, unless
+                    # a page lower than 1 was requested. The max page
+                    # is rounded up with integer division, so large
+                    # numbers are not converted to floats.
+                    last_page = -(-total_items // limit)
+                    if last_page:
+                        page = min(max(page, 1), last_page)
+                    else:
+                        page = int(page < 1)
+
+                    # Set the pagination fields
+                    return_value.limit = limit
+                    return_value.page = page
+                    return_value.total_items = total_items
+                    return_value.last_page = last_page
+
+                    # Calculate the start and end index for the
+                    # results
+                    start = (page - 1) * limit
+                    end = start + limit
+
+                    # Filter the data. Lists and tuples that fit on
+                    # the page are used as they are, so they aren't
+                    # copied. Data without a length is read until the
+                    # end of the page, so the other items don't have
+                    # to be read.
+                    if sized:
+                        if start or end < total_items or \
+                                type(return_value.data) not in (list, tuple):
+                            return_value.data = \
+                                return_value.data[start:end]
+                    else:
+                        return_value.data = list(
+                            islice(return_value.data, start, end))
             else:
-                # No matching URL found
-                self.logger.error(f'Endpoint {path} not found!')
-                error = self.raise_error(404, 'Endpoint not found')
+                # No matching URL found for this HTTP method. We abort the
+                # request with a 404 error
+                supported_method_list = ', '.join([
+                    f'"{http_method}"'
+                    for http_method in sorted(
+                        selected_endpoint.http_methods)])
+                error_message = (
+                    'Not a valid method for this endpoint! Given method: '
+                    f'"{method}", supported methods: {supported_method_list}')
+                self.logger.error(error_message)
+                error = self.raise_error(405, error_message)
                 if error:
                     return_value = error
                 else:
                     return None
 
-            # Get the end time and calculate the runtime in ms
-            time_end = timeit.default_timer()
-            return_value.runtime = (time_end - time_start) * 1000
+        else:
+            # No matching URL found
+            self.logger.error('Endpoint %s not found!', path)
+            error = self.raise_error(404, 'Endpoint not found')
+            if error:
+                return_value = error
+                error_json = self._error_json[(404, 'Endpoint not found')]
+            else:
+                return None
+
+        # Get the end time and calculate the runtime in ms. The times
+        # are integers in nanoseconds, so the difference is exact. The
+        # runtime is rounded here, so the encoder can use it as is.
+        time_end = perf_counter_ns()
+        return_value.runtime = round((time_end - time_start) / 1_000_000, 3)
 
-            self.logger.debug('Returning result')
+        self.logger.debug('Returning result')
 
-            # Check the 'error code'. If we have one, we have to set
-            # the Flask response accordingly.
-            response_code: int = 200
-            if return_value.error_code:
-                response_code = return_value.error_code
+        # Check the 'error code'. If we have one, we have to set
+        # the Flask response accordingly.
+        response_code: int = 200
+        if return_value.error_code:
+            response_code = return_value.error_code
 
-            # Return the result
+        # Return the result as MessagePack if the client prefers it
+        if use_msgpack:
             return FlaskResponse(
-                response=dumps(
-                    return_value, cls=RESTAPIJSONEncoder,
-                    **json_options
-                ),
+                response=dumps_msgpack(return_value),
+                status=response_code,
+                mimetype='application/msgpack'
+            )
+
+        # The JSON for errors with a fixed message is the same for
+        # every request, except for the runtime. It is created once
+        # and the runtime is added to it.
+        if error_json and not pretty:
+            return FlaskResponse(
+                response=error_json + dumps(return_value.runtime) + b'}',
+                status=response_code,
+                mimetype='application/json'
+            )
+
+        # Large lists of resources are streamed to the client, so
+        # the JSON doesn't have to be created in memory at once
+        if not pretty and return_value.success and \
+                type(return_value.data) is list and \
+                len(return_value.data) > self.stream_threshold:
+            return FlaskResponse(
+                response=stream_with_context(
+                    dumps_stream(return_value)),
                 status=response_code,
                 mimetype='application/json'
             )
 
+        # Create the JSON and cache it, if the response can be
+        # cached
+        body = dumps(return_value, pretty=pretty)
+        if cache_key and response_code == 200:
+            self.cache_response(cache_key, response_code, body,
+                                selected_endpoint.cache_ttl)
+
+        # Return the result. Compact JSON for GET requests gets a ETag.
+        return self.json_response(body, response_code,
+                                  conditional=not pretty and method == 'GET')
+
     def register_group(self, group: Group) -> None:
         """ Method to register a group for the REST API
 
@@ -528,14 +1048,220 @@ class RESTAPIGenerator:
         # Check if the group is of the correct type. If it isn't, the
         # user made a mistake and we raise an exception
         if isinstance(group, Group):
-            # Add the group to the set
+            # Add the group to the dict
             self.logger.debug(f'Adding Group: {group.name}')
-            self.groups.add(group)
+            self.groups[group] = None
+
+            # Reset the routing tables so they are created again with
+            # the endpoints for this group, and again when endpoints
+            # or subgroups are added to the group later
+            self.reset_routes()
+            group.add_change_callback(self.reset_routes)
         else:
             # Wrong type, give error
             raise InvalidGroupError(
                 f'Group is of type "{type(group)}", expected "{Group}"')
 
+    def reset_routes(self) -> None:
+        """ Method to remove the routing tables and the cached URLs,
+            so they are created again for the next request. Is called
+            when a group is registered, or when a endpoint or subgroup
+            is added to a registered group.
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            None
+        """
+        self.logger.debug('Resetting the routing tables')
+        self._static_endpoints = None
+        self._regex_endpoints = None
+        self._dispatcher = None
+        self.url_cache.cache_clear()
+
+    def freeze(self) -> None:
+        """ Method to freeze all registered groups. Should be called
+            after all groups, subgroups and endpoints are registered.
+            Freezing the groups flattens the tree of groups once, so
+            the list of endpoints doesn't have to be recreated for
+            every request.
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            None
+        """
+
+        self.logger.debug('Freezing groups')
+        for group in self.groups:
+            group.freeze()
+
+    def warmup(self) -> None:
+        """ Method to create the routing tables and fill the URL cache
+            with the static URLs before the first request. Without it,
+            this is done by the first requests, which are slower
+            because of that. Should be called after all groups are
+            registered; registering a group removes the tables again.
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            None
+        """
+
+        self.logger.debug('Warming up the routing tables')
+        static_endpoints, _ = self.get_routes()
+
+        # Resolve the static URLs, so they are in the URL cache. The
+        # cache is not filled further than its maximum size.
+        cache_size = self.url_cache.cache_info().maxsize
+        for path in islice(static_endpoints, cache_size):
+            self.lookup_url(path)
+
+    def get_routes(self) -> Tuple[Dict[str, EndpointURL],
+                                  List[EndpointURL]]:
+        """ Method that returns the routing tables for this REST API.
+            The first is a dict with the URLs that don't contain regex
+            characters and can be found with a dict lookup. The second
+            is a list with the URLs that contain regexes, and static
+            URLs that a regex URL registered before them matches. The
+            tables are created once and saved until a group is
+            registered or a registered group is changed.
+
+            Parameter
+            ---------
+            None
+
+            Returns
+            -------
+            tuple
+                A dict with the static EndpointURLs and a list with the
+                EndpointURLs that contain regexes.
+        """
+
+        if self._static_endpoints is None or self._regex_endpoints is None:
+            self.logger.debug('Creating routing tables')
+
+            # When more URLs match a path, the URL that was registered
+            # first wins, for static URLs and regex URLs alike
+            static_endpoints, regex_endpoints = split_routes(
+                self.get_all_endpoints())
+
+            self._static_endpoints = static_endpoints
+            self._regex_endpoints = regex_endpoints
+
+            # Create the function that finds the endpoint for a path
+            # with these tables
+            self._dispatcher = create_dispatcher(
+                static_endpoints, regex_endpoints)
+
+        return self._static_endpoints, self._regex_endpoints
+
+    def lookup_url(self, path: str) -> Optional[Tuple[Endpoint, re.Match]]:
+        """ Method that returns the endpoint for a path and the match
+            object for the path from the URL cache.
+
+            Parameter
+            ---------
+            path : str
+                The path to find the endpoint for.
+
+            Returns
+            -------
+            tuple[Endpoint, re.Match]
+                The endpoint and the match object for the path.
+
+            None
+                No endpoint was found for the path.
+        """
+        try:
+            return self.url_cache(path)
+        except URLNotFoundError:
+            return None
+
+    def resolve_known_url(self, path: str) -> Tuple[Endpoint, re.Match]:
+        """ Method that returns the endpoint for a path and the match
+            object for the path. The results of this method are cached
+            in `url_cache`. Raises a exception when no endpoint is
+            found, so the path is not cached.
+
+            Parameter
+            ---------
+            path : str
+                The path to find the endpoint for.
+
+            Returns
+            -------
+            tuple[Endpoint, re.Match]
+                The endpoint and the match object for the path.
+        """
+        resolved_url = self.resolve_url(path)
+        if resolved_url is None:
+            raise URLNotFoundError(f'No endpoint found for "{path}"')
+        return resolved_url
+
+    def resolve_url(self, path: str) -> Optional[Tuple[Endpoint, re.Match]]:
+        """ Method that returns the endpoint for a path and the match
+            object for the path.
+
+            Parameter
+            ---------
+            path : str
+                The path to find the endpoint for.
+
+            Returns
+            -------
+            tuple[Endpoint, re.Match]
+                The endpoint and the match object for the path.
+
+            None
+                No endpoint was found for the path.
+        """
+        self.logger.debug('Resolving endpoint for "%s"', path)
+        filtered_url_list = self.find_endpoints(path)
+        if len(filtered_url_list) == 1:
+            return filtered_url_list[0][0].endpoint, filtered_url_list[0][1]
+        return None
+
+    def find_endpoints(self, path: str) -> List[Tuple[EndpointURL, re.Match]]:
+        """ Method that finds the endpoint for a path, using the
+            dispatcher that is created with the routing tables.
+
+            Parameter
+            ---------
+            path : str
+                The path to find the endpoint for.
+
+            Returns
+            -------
+            list[tuple[EndpointURL, re.Match]]
+                A list with the found EndpointURLs and the match
+                objects for the path.
+        """
+
+        # Make sure the routing tables and the dispatcher are created.
+        # The dispatcher is read once, because the tables can be reset
+        # at the same time.
+        dispatcher = self._dispatcher
+        if dispatcher is None:
+            self.get_routes()
+            dispatcher = self._dispatcher
+
+        # Find the endpoint with the dispatcher
+        found = dispatcher(path)
+        if found:
+            return [found]
+        return []
+
     def get_all_endpoints(self) -> List[EndpointURL]:
         """ Method that returns all Endpoints for this REST API
             in a list with EndpointURL objects.
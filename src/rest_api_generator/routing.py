@@ -0,0 +1,355 @@
+""" This module includes the functions and the RouteTrie class that are
+    used by the RESTAPIGenerator to find the endpoint for a path. """
+
+import re
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from rest_api_generator.endpoint_url import EndpointURL
+
+# Characters that have a special meaning in regexes. URLs without these
+# characters are static and can be found with a dict lookup.
+REGEX_CHARACTERS = frozenset('.^$*+?{}[]()|\\')
+
+# Characters that make the character before it optional or repeated
+QUANTIFIER_CHARACTERS = frozenset('?*+{')
+
+# Regexes to find named groups, named backreferences and numbered
+# backreferences in the regexes for the URLs
+_NAMED_GROUP = re.compile(r'(?<!\\)\(\?P([<=])(\w+)')
+_NUMBERED_BACKREFERENCE = re.compile(r'\\[1-9]')
+
+# Type for the functions that find the endpoint for a path
+Matcher = Callable[[str], Optional[Tuple[EndpointURL, re.Match]]]
+
+
+def combine_regexes(regexes: List[str]) -> Optional[re.Pattern]:
+    """ Function that combines a list of regexes into one regex. Every
+        regex is put in a named group 'ep<index>', so the group that
+        matched identifies the regex. Named groups in the regexes are
+        renamed, because a name can only be used once in a regex.
+
+        Parameters
+        ----------
+        regexes : List[str]
+            The regexes to combine.
+
+        Returns
+        -------
+        re.Pattern
+            The combined regex.
+
+        None
+            The regexes could not be combined, for instance because
+            they contain numbered backreferences, or there are no
+            regexes to combine.
+    """
+
+    if not regexes or any(_NUMBERED_BACKREFERENCE.search(regex)
+                          for regex in regexes):
+        return None
+
+    parts: List[str] = list()
+    for index, regex in enumerate(regexes):
+        regex = _NAMED_GROUP.sub(rf'(?P\1ep{index}_\2', regex)
+        parts.append(f'(?P<ep{index}>{regex})')
+
+    try:
+        return re.compile('|'.join(parts))
+    except re.error:
+        return None
+
+
+def create_matcher(endpoints: List[EndpointURL]) -> Matcher:
+    """ Function that creates a function that returns the first
+        EndpointURL in the list that matches a path. The regexes of
+        the EndpointURLs are combined, so the endpoint can be found in
+        one match. If the regexes could not be combined, they are
+        matched one by one.
+
+        Parameters
+        ----------
+        endpoints : List[EndpointURL]
+            The EndpointURLs to match, in the order they should be
+            matched.
+
+        Returns
+        -------
+        Matcher
+            A function that returns the EndpointURL and the match object
+            for a path, or None if no endpoint matches.
+    """
+
+    combined_regex = combine_regexes([endpoint.url for endpoint in endpoints])
+
+    if combined_regex:
+        match_combined = combined_regex.fullmatch
+
+        # Map the number of the group for every endpoint in the
+        # combined regex to the endpoint
+        endpoint_by_group: Dict[int, EndpointURL] = {
+            combined_regex.groupindex[f'ep{index}']: endpoint
+            for index, endpoint in enumerate(endpoints)
+        }
+
+        def match(path: str) -> Optional[Tuple[EndpointURL, re.Match]]:
+            # The group that matched last is the group around the regex
+            # of the endpoint. The regex for the endpoint is matched
+            # again, so the endpoint gets a match object with the
+            # groups it defined.
+            combined_match = match_combined(path)
+            if combined_match:
+                endpoint = endpoint_by_group[combined_match.lastindex]
+                return endpoint, endpoint.pattern.fullmatch(path)
+            return None
+
+        return match
+
+    def match_one_by_one(path: str) -> Optional[Tuple[EndpointURL, re.Match]]:
+        # Match the regexes one by one and return the first match
+        for endpoint in endpoints:
+            url_match = endpoint.pattern.fullmatch(path)
+            if url_match:
+                return endpoint, url_match
+        return None
+
+    return match_one_by_one
+
+
+def static_prefix(url: str) -> List[str]:
+    """ Function that returns the segments at the start of a URL regex
+        that are static. Every path that matches the regex starts with
+        these segments, each followed by a '/'.
+
+        Parameters
+        ----------
+        url : str
+            The URL regex.
+
+        Returns
+        -------
+        List[str]
+            The static segments.
+    """
+
+    # A alternation can match paths that don't start with the first
+    # segment, so URLs with alternations have no static prefix
+    if '|' in url:
+        return []
+
+    # A segment is static if it has no regex characters and the '/'
+    # after it is not made optional or repeated
+    segments = url.split('/')
+    prefix: List[str] = list()
+    for segment, next_segment in zip(segments, segments[1:]):
+        if not REGEX_CHARACTERS.isdisjoint(segment) or \
+                next_segment[:1] in QUANTIFIER_CHARACTERS:
+            break
+        prefix.append(segment)
+    return prefix
+
+
+def _no_match(path: str) -> None:
+    """ Matcher for nodes without endpoints.
+
+        Parameters
+        ----------
+        path : str
+            The path to match.
+
+        Returns
+        -------
+        None
+            There are no endpoints to match.
+    """
+    return None
+
+
+@dataclass(slots=True)
+class _RouteTrieNode:
+    """ Class for the nodes of a RouteTrie.
+
+        Members
+        -------
+        children : Dict[str, _RouteTrieNode]
+            The child nodes, by segment.
+
+        endpoints : List[Tuple[int, EndpointURL]]
+            The EndpointURLs with the static prefix that ends in this
+            node, with their position in the list of EndpointURLs.
+
+        match : Matcher
+            The function that matches the EndpointURLs of this node and
+            the nodes above it.
+    """
+
+    children: Dict[str, '_RouteTrieNode'] = field(default_factory=dict)
+    endpoints: List[Tuple[int, EndpointURL]] = field(default_factory=list)
+    match: Matcher = _no_match
+
+
+class RouteTrie:
+    """ Class that finds the EndpointURL for a path. The EndpointURLs
+        are put in a trie, keyed on the static segments at the start of
+        their URLs. To find a path, the trie is walked with the
+        segments of the path and only the EndpointURLs on that route
+        are matched. The EndpointURL that comes first in the given
+        list wins when more than one matches.
+    """
+
+    def __init__(self, endpoints: List[EndpointURL]) -> None:
+        """ The initiator creates the trie and the matchers for the
+            nodes.
+
+            Parameters
+            ----------
+            endpoints : List[EndpointURL]
+                The EndpointURLs for the trie, in the order they should
+                be matched.
+
+            Returns
+            -------
+            None
+        """
+        self.root = _RouteTrieNode()
+
+        # Add the endpoints to the node for their static prefix
+        for index, endpoint in enumerate(endpoints):
+            node = self.root
+            for segment in static_prefix(endpoint.url):
+                node = node.children.setdefault(segment, _RouteTrieNode())
+            node.endpoints.append((index, endpoint))
+
+        # Create the matchers
+        self._create_matchers(self.root, [])
+
+    def _create_matchers(self,
+                         node: _RouteTrieNode,
+                         parent_endpoints: List[Tuple[int, EndpointURL]]
+                         ) -> None:
+        """ Method that creates the matchers for a node and the nodes
+            below it. The matcher for a node matches the EndpointURLs
+            of the node and all nodes above it, in their original order.
+
+            Parameters
+            ----------
+            node : _RouteTrieNode
+                The node to create the matcher for.
+
+            parent_endpoints : List[Tuple[int, EndpointURL]]
+                The EndpointURLs of the nodes above this node.
+
+            Returns
+            -------
+            None
+        """
+        endpoints = sorted(parent_endpoints + node.endpoints,
+                           key=lambda item: item[0])
+        if endpoints:
+            node.match = create_matcher(
+                [endpoint for _, endpoint in endpoints])
+
+        for child in node.children.values():
+            self._create_matchers(child, endpoints)
+
+    def find(self, path: str) -> Optional[Tuple[EndpointURL, re.Match]]:
+        """ Method that finds the EndpointURL for a path.
+
+            Parameters
+            ----------
+            path : str
+                The path to find the EndpointURL for.
+
+            Returns
+            -------
+            tuple[EndpointURL, re.Match]
+                The EndpointURL and the match object for the path.
+
+            None
+                No EndpointURL matches the path.
+        """
+
+        # Walk the trie as far as the segments of the path go
+        node = self.root
+        for segment in path.split('/'):
+            child = node.children.get(segment)
+            if child is None:
+                break
+            node = child
+
+        return node.match(path)
+
+
+def split_routes(endpoints: List[EndpointURL]
+                 ) -> Tuple[Dict[str, EndpointURL], List[EndpointURL]]:
+    """ Function that splits the EndpointURLs in static URLs, that can
+        be found with a dict lookup, and URLs that have to be matched
+        as regex. The EndpointURL that is registered first wins when
+        more than one matches a path, so a static URL is only put in
+        the dict if no regex URL before it matches the URL. Otherwise,
+        it is matched as a regex after that regex URL.
+
+        Parameters
+        ----------
+        endpoints : List[EndpointURL]
+            The EndpointURLs, in the order they were registered.
+
+        Returns
+        -------
+        tuple
+            A dict with the static EndpointURLs and a list with the
+            EndpointURLs that have to be matched as regex, in the order
+            they were registered.
+    """
+
+    static_endpoints: Dict[str, EndpointURL] = dict()
+    regex_endpoints: List[EndpointURL] = list()
+    for endpoint in endpoints:
+        if REGEX_CHARACTERS.isdisjoint(endpoint.url) and \
+                endpoint.url not in static_endpoints and \
+                not any(regex_endpoint.pattern.fullmatch(endpoint.url)
+                        for regex_endpoint in regex_endpoints):
+            static_endpoints[endpoint.url] = endpoint
+        else:
+            regex_endpoints.append(endpoint)
+    return static_endpoints, regex_endpoints
+
+
+def create_dispatcher(static_endpoints: Dict[str, EndpointURL],
+                      regex_endpoints: List[EndpointURL]) -> Matcher:
+    """ Function that creates a function that finds the endpoint for a
+        path. Static URLs are found with a dict lookup. The other URLs
+        are found with a RouteTrie. The tables should be created with
+        `split_routes`, so the dict only has static URLs that win over
+        the regex URLs. The routing tables are bound to the
+        created function, so it doesn't have to look them up on the
+        RESTAPIGenerator for every path.
+
+        Parameters
+        ----------
+        static_endpoints : Dict[str, EndpointURL]
+            The EndpointURLs without regex characters.
+
+        regex_endpoints : List[EndpointURL]
+            The EndpointURLs with regex characters.
+
+        Returns
+        -------
+        Matcher
+            A function that returns the EndpointURL and the match object
+            for a path, or None if no endpoint was found.
+    """
+
+    get_static = static_endpoints.get
+    find_regex = RouteTrie(regex_endpoints).find
+
+    def dispatch(path: str) -> Optional[Tuple[EndpointURL, re.Match]]:
+        # Check if the URL is a static URL. If it is, we don't have to
+        # match the regexes.
+        endpoint = get_static(path)
+        if endpoint:
+            return endpoint, endpoint.pattern.fullmatch(path)
+
+        return find_regex(path)
+
+    return dispatch
@@ -0,0 +1,36 @@
+"""
+    This module defines unit tests for the JSON encoder of the
+    RESTAPIGenerator
+"""
+# Add include path. We need to do this because we are not in the
+# original path
+import sys
+import os
+from datetime import datetime
+sys.path.append(
+    os.path.abspath(os.path.join(os.path.dirname(
+        __file__), os.path.pardir, os.path.pardir)) + '/src'
+)
+from rest_api_generator import Response
+from rest_api_generator import json_encoder
+from rest_api_generator.json_encoder import dumps, dumps_stream
+
+
+# Tests
+def test_dumps_without_orjson(monkeypatch) -> None:
+    """ Unit test for dumps without orjson
+
+        Check if the JSON created with the standard library is the same
+        as the JSON created with orjson.
+    """
+    response = Response(
+        data=[{'name': 'tëst', 'created': datetime(2021, 5, 1, 12, 30)},
+              {'name': 'test', 'value': 1.5, 'items': [1, None, True]}],
+        runtime=1.235)
+    expected = dumps(response)
+    expected_stream = b''.join(dumps_stream(response, chunk_size=1))
+
+    monkeypatch.setattr(json_encoder, 'orjson', None)
+    assert dumps(response) == expected
+    assert b''.join(dumps_stream(response, chunk_size=1)) == expected
+    assert expected_stream == expected
@@ -5,13 +5,26 @@
 # original path
 import sys
 import os
+import time
+import asyncio
 import pytest
-from typing import List
+from typing import Any, Iterator, List, Tuple
+from flask import Flask
+from sqlalchemy import Column, Integer, create_engine
+from sqlalchemy.orm import sessionmaker
 sys.path.append(
     os.path.abspath(os.path.join(os.path.dirname(
         __file__), os.path.pardir, os.path.pardir)) + '/src'
 )
-from rest_api_generator import RESTAPIGenerator, Group, EndpointURL
+from rest_api_generator import (Authorization, EndpointScopes, EndpointURL,
+                                Group, Response, RESTAPIGenerator)
+from rest_api_generator.exceptions import (BlueprintRegisteredError,
+                                           GroupFrozenError,
+                                           InvalidInputError,
+                                           ResourceForbiddenError,
+                                           ResourceNotFoundError,
+                                           UnauthorizedForResourceError)
+from database import Database
 
 
 # Fixtures
@@ -72,6 +85,37 @@ def fixture_rest_api() -> RESTAPIGenerator:
     return rest_api
 
 
+class LazyTestClient:
+    """ Test client for a Flask app with the Blueprint of a
+        RESTAPIGenerator. The app is created on the first request, so
+        the test can register endpoints and change the settings of the
+        RESTAPIGenerator first. """
+
+    def __init__(self, rest_api: RESTAPIGenerator) -> None:
+        self.rest_api = rest_api
+        self.client = None
+
+    def __getattr__(self, name: str) -> Any:
+        if self.client is None:
+            app = Flask(__name__)
+            app.register_blueprint(self.rest_api.blueprint)
+            self.client = app.test_client()
+        return getattr(self.client, name)
+
+
+@pytest.fixture
+def fixture_api_client() -> Iterator[
+        Tuple[RESTAPIGenerator, Group, LazyTestClient]]:
+    """ Fixture to set up a RESTAPIGenerator with a registered group
+        without endpoints, and a test client for it. The test registers
+        the endpoints it needs in the group. """
+
+    rest_api = RESTAPIGenerator('rest_api_unittest_client')
+    group = Group('group_a')
+    rest_api.register_group(group)
+    yield rest_api, group, LazyTestClient(rest_api)
+
+
 @pytest.fixture
 def fixture_expected_urls() -> List[str]:
     """ Fixture to create a list of expected URLs """
@@ -136,3 +180,527 @@ def test_api_group_registered_urls_length(fixture_rest_api, fixture_expected_url
 
     # Done! Everything looks fine
     assert True
+
+
+def test_api_group_frozen_urls(fixture_rest_api, fixture_expected_urls) -> None:
+    """ Unit test for frozen groups
+
+        Check if freezing the groups results in the same list of URLs.
+    """
+
+    # Freeze the groups and retrieve a list of registered endpoints
+    fixture_rest_api.freeze()
+    endpoints: List[EndpointURL] = fixture_rest_api.get_all_endpoints()
+
+    # Check if the URLs are the same
+    registered_urls = [endpoint.url for endpoint in endpoints]
+    assert sorted(registered_urls) == sorted(fixture_expected_urls)
+
+
+def test_api_group_frozen_register_endpoint() -> None:
+    """ Unit test for frozen groups
+
+        Check if registering a endpoint to a frozen group raises a
+        GroupFrozenError.
+    """
+
+    # Create a frozen group
+    group = Group('group_a')
+    group.freeze()
+
+    # Registering a endpoint should fail
+    with pytest.raises(GroupFrozenError):
+        @group.register_endpoint(['endpoint_1'])
+        def group_a_endpoint_1(self):
+            pass
+
+
+def test_api_subgroup_urls() -> None:
+    """ Unit test for subgroups
+
+        Check if the URLs for endpoints in subgroups contain the
+        prefixes of all parent groups, also when the endpoints are
+        requested more then once.
+    """
+
+    # Create a group with a subgroup
+    group = Group('group_a')
+    subgroup = Group('subgroup_a')
+    group.add_subgroup(subgroup)
+
+    @subgroup.register_endpoint(['endpoint_1'])
+    def subgroup_a_endpoint_1(self):
+        pass
+
+    # Request the endpoints twice, before and after freezing
+    group.get_endpoints()
+    assert [x.url for x in group.get_endpoints()] == [
+        'group_a/subgroup_a/endpoint_1']
+    group.freeze()
+    assert [x.url for x in group.get_endpoints()] == [
+        'group_a/subgroup_a/endpoint_1']
+
+
+def test_api_find_endpoints_regex_groups() -> None:
+    """ Unit test for finding endpoints with regexes
+
+        Check if endpoints with the same named groups are found and if
+        the match object contains the groups of the endpoint.
+    """
+
+    # Create a API with endpoints that use the same group names
+    rest_api = RESTAPIGenerator('rest_api_unittest_find')
+    group = Group('group_a')
+    rest_api.register_group(group)
+
+    @group.register_endpoint(['tags/(?P<resource_id>[0-9]+)'])
+    def group_a_tags(self):
+        pass
+
+    @group.register_endpoint(['users/(?P<resource_id>[0-9]+)'])
+    def group_a_users(self):
+        pass
+
+    @group.register_endpoint(['users'])
+    def group_a_user_list(self):
+        pass
+
+    # Find the endpoints
+    found = rest_api.find_endpoints('group_a/users/12')
+    assert len(found) == 1
+    assert found[0][0].url == 'group_a/users/(?P<resource_id>[0-9]+)'
+    assert found[0][1].group('resource_id') == '12'
+    assert rest_api.find_endpoints('group_a/users')[0][0].url == (
+        'group_a/users')
+    assert rest_api.find_endpoints('group_a/users/a') == []
+
+
+def test_api_url_cache_cleared_on_register() -> None:
+    """ Unit test for the URL cache
+
+        Check if the URL cache is cleared when a group is registered, so
+        URLs that were not found before can be found after registering
+        the group.
+    """
+
+    # Create a API without groups
+    rest_api = RESTAPIGenerator('rest_api_unittest_cache')
+    assert rest_api.lookup_url('group_a/endpoint_1') is None
+
+    # Register a group with the endpoint
+    group = Group('group_a')
+
+    @group.register_endpoint(['endpoint_1'])
+    def group_a_endpoint_1(self):
+        pass
+
+    rest_api.register_group(group)
+    resolved = rest_api.url_cache('group_a/endpoint_1')
+    assert resolved is not None
+    assert resolved[0].func is group_a_endpoint_1
+
+
+def test_api_routes_reset_on_group_change(fixture_api_client) -> None:
+    """ Unit test for changing a registered group
+
+        Check if endpoints and subgroups that are added to a registered
+        group after a request is served can be found.
+    """
+    rest_api, group, client = fixture_api_client
+
+    @group.register_endpoint(['endpoint_1'], http_methods=['GET'])
+    def group_a_endpoint_1(auth, url_match):
+        return Response(data=[])
+
+    assert client.get('/group_a/endpoint_1').status_code == 200
+
+    # Add a endpoint to the group
+    @group.register_endpoint(['endpoint_2'], http_methods=['GET'])
+    def group_a_endpoint_2(auth, url_match):
+        return Response(data=[])
+
+    assert client.get('/group_a/endpoint_2').status_code == 200
+
+    # Add a subgroup, and a endpoint to the subgroup after that
+    subgroup = Group('subgroup')
+    group.add_subgroup(subgroup)
+    assert client.get('/group_a/subgroup/endpoint_1').status_code == 404
+
+    @subgroup.register_endpoint(['endpoint_1'], http_methods=['GET'])
+    def subgroup_endpoint_1(auth, url_match):
+        return Response(data=[])
+
+    assert client.get('/group_a/subgroup/endpoint_1').status_code == 200
+
+
+def test_api_url_cache_not_found(fixture_api_client) -> None:
+    """ Unit test for paths that are not found
+
+        Check if paths that are not found are not cached, and can be
+        found after a endpoint is added for them.
+    """
+    rest_api, group, client = fixture_api_client
+    assert client.get('/group_a/endpoint_1').status_code == 404
+    assert rest_api.url_cache.cache_info().currsize == 0
+
+    @group.register_endpoint(['endpoint_1'], http_methods=['GET'])
+    def group_a_endpoint_1(auth, url_match):
+        return Response(data=[])
+
+    assert client.get('/group_a/endpoint_1').status_code == 200
+    assert client.get('/group_a/endpoint_2').status_code == 404
+    assert rest_api.url_cache.cache_info().currsize == 1
+
+
+def test_api_accepted_methods() -> None:
+    """ Unit test for accepted HTTP methods
+
+        Check if methods that are accepted before the Blueprint is
+        registered are routed by Flask, and if denied methods are not.
+        Changing the methods after that should raise a exception.
+    """
+
+    # Create a API that accepts POST and denies GET
+    rest_api = RESTAPIGenerator('rest_api_unittest_methods')
+    rest_api.accept_method('POST')
+    rest_api.deny_method('GET')
+    rest_api.deny_method('PATCH')
+    assert rest_api.accepted_http_methods == {'POST'}
+
+    # Register the Blueprint and check the routes
+    app = Flask(__name__)
+    app.register_blueprint(rest_api.blueprint)
+    client = app.test_client()
+    assert client.post('/group_a/endpoint_1').status_code == 404
+    assert client.get('/group_a/endpoint_1').status_code == 405
+
+    # Changing the methods after registering the Blueprint fails
+    with pytest.raises(BlueprintRegisteredError):
+        rest_api.accept_method('GET')
+    with pytest.raises(BlueprintRegisteredError):
+        rest_api.deny_method('POST')
+    assert rest_api.accepted_http_methods == {'POST'}
+
+
+def test_api_auth_cache(fixture_api_client, monkeypatch) -> None:
+    """ Unit test for the authorization cache
+
+        Check if the authorization function is only called once for the
+        same token when the cache is enabled, and again after the cache
+        is invalidated. The data of the authorization is created for
+        every request.
+    """
+    rest_api, group, client = fixture_api_client
+    calls: List[str] = list()
+    data: List[Any] = list()
+
+    # Use the same time for all requests, so the results don't expire
+    monkeypatch.setattr('rest_api_generator.rest_api_generator.monotonic',
+                        lambda: 1000.0)
+
+    # Use a authorization function that counts the calls
+    def authorize(authorization, scopes) -> Authorization:
+        calls.append(authorization.token)
+        return Authorization(authorized=authorization.token == 'valid',
+                             data=object())
+
+    rest_api.authorization_function = authorize
+    rest_api.authorization_data_function = lambda authorization: (
+        authorization.token, object())
+    rest_api.auth_cache_ttl = 60
+
+    @group.register_endpoint(['endpoint_1'], http_methods=['GET'],
+                             auth_needed=True,
+                             auth_scopes=EndpointScopes(GET=['scope']))
+    def group_a_endpoint_1(auth, url_match):
+        data.append(auth.data)
+        return Response(data=[])
+
+    # Do requests with the same token
+    headers = {'Authorization': 'Bearer valid'}
+    assert client.get('/group_a/endpoint_1', headers=headers).status_code \
+        == 200
+    assert client.get('/group_a/endpoint_1', headers=headers).status_code \
+        == 200
+    assert calls == ['valid']
+    assert len(data) == 2
+    assert data[0][0] == data[1][0] == 'valid'
+    assert data[0][1] is not data[1][1]
+
+    # Invalidate the cache
+    rest_api.invalidate_auth_cache()
+    client.get('/group_a/endpoint_1', headers=headers)
+    assert calls == ['valid', 'valid']
+
+
+def test_api_paginate_iterator(fixture_api_client) -> None:
+    """ Unit test for pagination of iterators
+
+        Check if a endpoint that returns a iterator and sets the total
+        number of items gets paginated, without reading the items after
+        the requested page.
+    """
+    rest_api, group, client = fixture_api_client
+    read: List[int] = list()
+
+    def items():
+        for item in range(100):
+            read.append(item)
+            yield item
+
+    @group.register_endpoint(['endpoint_1'], http_methods=['GET'])
+    def group_a_endpoint_1(auth, url_match):
+        return Response(data=items(), total_items=100)
+
+    # Request the second page
+    result = client.get('/group_a/endpoint_1?page=2&limit=10').get_json()
+    assert result['data'] == list(range(10, 20))
+    assert result['last_page'] == 10
+    assert result['total_items'] == 100
+    assert len(read) == 20
+
+
+def test_api_paginate_malformed_arguments(fixture_api_client) -> None:
+    """ Unit test for pagination with malformed arguments
+
+        Check if malformed values for 'page' and 'limit' fall back to
+        the defaults instead of resulting in a error.
+    """
+    rest_api, group, client = fixture_api_client
+    rest_api.default_limit = 10
+
+    @group.register_endpoint(['endpoint_1'], http_methods=['GET'])
+    def group_a_endpoint_1(auth, url_match):
+        return Response(data=list(range(100)))
+
+    # Request the endpoint with malformed arguments
+    response = client.get('/group_a/endpoint_1?page=abc&limit=0')
+    assert response.status_code == 200
+    result = response.get_json()
+    assert result['data'] == list(range(10))
+    assert result['page'] == 1
+    assert result['limit'] == 10
+
+
+def test_api_endpoint_without_response(fixture_api_client) -> None:
+    """ Unit test for endpoints that don't return a Response
+
+        Check if a endpoint that returns None results in a 500 error
+        response instead of a crash in the API generator.
+    """
+    rest_api, group, client = fixture_api_client
+
+    @group.register_endpoint(['endpoint_1'], http_methods=['GET'])
+    def group_a_endpoint_1(auth, url_match):
+        return None
+
+    result = client.get('/group_a/endpoint_1')
+    assert result.status_code == 500
+    assert result.get_json()['error_message'] == 'Unknown error'
+
+
+def test_api_response_cache(fixture_api_client) -> None:
+    """ Unit test for the response cache
+
+        Check if the responses of cacheable endpoints are cached per
+        URL and arguments, and if the cache can be invalidated.
+    """
+    rest_api, group, client = fixture_api_client
+    calls: List[int] = list()
+
+    @group.register_endpoint(['endpoint_1'], http_methods=['GET'],
+                             cacheable=True)
+    def group_a_endpoint_1(auth, url_match):
+        calls.append(1)
+        return Response(data=[len(calls)])
+
+    # Do the same request twice and one with other arguments
+    first = client.get('/group_a/endpoint_1').get_json()
+    second = client.get('/group_a/endpoint_1').get_json()
+    assert first['data'] == second['data'] == [1]
+    assert 'runtime' in second
+    assert client.get('/group_a/endpoint_1?page=1').get_json()['data'] == [2]
+
+    # Invalidate the cache
+    rest_api.invalidate_response_cache()
+    assert client.get('/group_a/endpoint_1').get_json()['data'] == [3]
+
+
+def test_api_response_cache_ttl(fixture_api_client) -> None:
+    """ Unit test for the expiry of the response cache
+
+        Check if a cached response is not used anymore after the
+        'cache_ttl' of the endpoint.
+    """
+    rest_api, group, client = fixture_api_client
+    calls: List[int] = list()
+
+    @group.register_endpoint(['endpoint_1'], http_methods=['GET'],
+                             cacheable=True, cache_ttl=0.05)
+    def group_a_endpoint_1(auth, url_match):
+        calls.append(1)
+        return Response(data=[len(calls)])
+
+    # Do the same request before and after the TTL
+    assert client.get('/group_a/endpoint_1').get_json()['data'] == [1]
+    assert client.get('/group_a/endpoint_1').get_json()['data'] == [1]
+    time.sleep(0.1)
+    assert client.get('/group_a/endpoint_1').get_json()['data'] == [2]
+
+
+def test_api_etag(fixture_api_client) -> None:
+    """ Unit test for ETags
+
+        Check if GET responses get a ETag that doesn't depend on the
+        runtime, and if a '304 Not Modified' is returned when the
+        client sends the ETag.
+    """
+    rest_api, group, client = fixture_api_client
+
+    @group.register_endpoint(['endpoint_1'], http_methods=['GET'])
+    def group_a_endpoint_1(auth, url_match):
+        return Response(data=[1, 2, 3])
+
+    # Do a request and repeat it with the ETag
+    etag = client.get('/group_a/endpoint_1').headers['ETag']
+    second = client.get('/group_a/endpoint_1',
+                        headers={'If-None-Match': etag})
+    assert second.status_code == 304
+    assert second.data == b''
+    assert second.headers['ETag'] == etag
+
+    # Other arguments give a other result and pretty JSON has no ETag
+    other = client.get('/group_a/endpoint_1?limit=2',
+                       headers={'If-None-Match': etag})
+    assert other.status_code == 200
+    assert other.headers['ETag'] != etag
+    assert 'ETag' not in client.get('/group_a/endpoint_1?pretty').headers
+
+
+def test_api_vary_accept(fixture_api_client) -> None:
+    """ Unit test for the 'Vary' header
+
+        Check if JSON, MessagePack, '304 Not Modified' and error
+        responses have 'Accept' in the 'Vary' header, so caches keep
+        the JSON and MessagePack responses apart.
+    """
+    rest_api, group, client = fixture_api_client
+
+    @group.register_endpoint(['endpoint_1'], http_methods=['GET'])
+    def group_a_endpoint_1(auth, url_match):
+        return Response(data=[1, 2, 3])
+
+    # Request JSON, MessagePack, the JSON again with the ETag and a
+    # endpoint that doesn't exist
+    json_response = client.get('/group_a/endpoint_1')
+    msgpack_response = client.get(
+        '/group_a/endpoint_1', headers={'Accept': 'application/msgpack'})
+    assert msgpack_response.mimetype == 'application/msgpack'
+    not_modified = client.get(
+        '/group_a/endpoint_1',
+        headers={'If-None-Match': json_response.headers['ETag']})
+    assert not_modified.status_code == 304
+    not_found = client.get('/group_a/endpoint_2')
+    for response in (json_response, msgpack_response, not_modified,
+                     not_found):
+        assert 'Accept' in response.vary
+
+
+def test_api_coroutine_endpoint(fixture_api_client) -> None:
+    """ Unit test for endpoints that are coroutine functions
+
+        Check if a endpoint that is a coroutine function is run and can
+        wait for more coroutines at the same time.
+    """
+    rest_api, group, client = fixture_api_client
+
+    async def get_item(item: int) -> int:
+        await asyncio.sleep(0)
+        return item
+
+    @group.register_endpoint(['endpoint_1'], http_methods=['GET'])
+    async def group_a_endpoint_1(auth, url_match):
+        return Response(data=list(await asyncio.gather(
+            get_item(1), get_item(2), get_item(3))))
+
+    result = client.get('/group_a/endpoint_1').get_json()
+    assert result['data'] == [1, 2, 3]
+
+
+@pytest.mark.parametrize('exception, error_code', [
+    (InvalidInputError, 400),
+    (UnauthorizedForResourceError, 401),
+    (ResourceForbiddenError, 403),
+    (ResourceNotFoundError, 404),
+    (ValueError, 500)
+])
+def test_api_endpoint_errors(fixture_api_client, exception,
+                             error_code) -> None:
+    """ Unit test for errors raised by endpoints
+
+        Check if the exceptions that endpoints raise result in the
+        correct HTTP error.
+    """
+    rest_api, group, client = fixture_api_client
+
+    @group.register_endpoint(['endpoint_1'], http_methods=['GET'])
+    def group_a_endpoint_1(auth, url_match):
+        raise exception('error')
+
+    response = client.get('/group_a/endpoint_1')
+    assert response.status_code == error_code
+    assert response.get_json()['error_code'] == error_code
+
+
+def test_api_warmup() -> None:
+    """ Unit test for warming up the RESTAPIGenerator
+
+        Check if the static URLs are in the URL cache after the warmup.
+    """
+
+    # Create a API with a static and a regex endpoint
+    rest_api = RESTAPIGenerator('rest_api_unittest_warmup')
+    group = Group('group_a')
+
+    @group.register_endpoint(['endpoint_1', 'endpoint_(?P<id>[0-9]+)'],
+                             http_methods=['GET'])
+    def group_a_endpoint_1(auth, url_match):
+        return Response()
+
+    rest_api.register_group(group)
+    rest_api.warmup()
+    assert rest_api.url_cache.cache_info().currsize == 1
+
+    # The cached result is used for the first request
+    rest_api.url_cache('group_a/endpoint_1')
+    assert rest_api.url_cache.cache_info().hits == 1
+
+
+def test_api_paginate_query(fixture_api_client) -> None:
+    """ Unit test for pagination of SQLalchemy queries
+
+        Check if a endpoint that returns a SQLalchemy query gets
+        paginated with the count from the database.
+    """
+    rest_api, group, client = fixture_api_client
+
+    # Create a database with items
+    class Item(Database.base_class):
+        __tablename__ = 'unittest_paginate_items'
+        id = Column(Integer, primary_key=True)
+
+    engine = create_engine('sqlite://')
+    Item.__table__.create(engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all([Item(id=item_id) for item_id in range(1, 31)])
+    session.commit()
+
+    @group.register_endpoint(['endpoint_1'], http_methods=['GET'])
+    def group_a_endpoint_1(auth, url_match):
+        return Response(data=session.query(Item).order_by(Item.id))
+
+    # Request the last page
+    result = client.get('/group_a/endpoint_1?page=3&limit=10').get_json()
+    assert result['data'] == [{'id': item_id} for item_id in range(21, 31)]
+    assert result['total_items'] == 30
+    assert result['last_page'] == 3
@@ -0,0 +1,95 @@
+"""
+    This module defines unit tests for the routing of the
+    RESTAPIGenerator
+"""
+# Add include path. We need to do this because we are not in the
+# original path
+import sys
+import os
+import pytest
+from typing import List
+sys.path.append(
+    os.path.abspath(os.path.join(os.path.dirname(
+        __file__), os.path.pardir, os.path.pardir)) + '/src'
+)
+from rest_api_generator import Endpoint, EndpointURL
+from rest_api_generator.routing import (RouteTrie, create_dispatcher,
+                                        split_routes, static_prefix)
+
+
+# Fixtures
+@pytest.fixture
+def fixture_endpoint_urls() -> List[EndpointURL]:
+    """ Fixture to set up a list with EndpointURLs with regexes. """
+
+    endpoint = Endpoint(url_suffix=[], func=lambda auth, match: None)
+    urls = [
+        'api/users/(?P<resource_id>[0-9]+)',
+        'api/tags/(?P<resource_id>[0-9]+)',
+        'api/(?P<resource>[a-z]+)/(?P<resource_id>[0-9]+)',
+        'api/users/?',
+        '(?P<anything>.+)/test',
+        'api/tags/(x)\\1'
+    ]
+    return [EndpointURL(url, endpoint) for url in urls]
+
+
+# Tests
+def test_static_prefix() -> None:
+    """ Unit test for static_prefix
+
+        Check if only the segments that every matching path starts with
+        are returned.
+    """
+    assert static_prefix('api/users/(?P<id>[0-9]+)') == ['api', 'users']
+    assert static_prefix('api/users/?') == ['api']
+    assert static_prefix('api/users|tags/') == []
+    assert static_prefix('(?P<anything>.+)/test') == []
+    assert static_prefix('api/users') == ['api']
+
+
+def test_route_trie_first_match(fixture_endpoint_urls) -> None:
+    """ Unit test for RouteTrie
+
+        Check if the first EndpointURL in the list that matches the path
+        is returned, with a match object with its own groups.
+    """
+    trie = RouteTrie(fixture_endpoint_urls)
+
+    endpoint_url, url_match = trie.find('api/users/12')
+    assert endpoint_url is fixture_endpoint_urls[0]
+    assert url_match.group('resource_id') == '12'
+
+    endpoint_url, url_match = trie.find('api/groups/3')
+    assert endpoint_url is fixture_endpoint_urls[2]
+    assert url_match.groupdict() == {'resource': 'groups',
+                                     'resource_id': '3'}
+
+    assert trie.find('api/users')[0] is fixture_endpoint_urls[3]
+    assert trie.find('api/users/test')[0] is fixture_endpoint_urls[4]
+    assert trie.find('api/tags/xx')[0] is fixture_endpoint_urls[5]
+    assert trie.find('api/users/a') is None
+
+
+def test_dispatcher_registration_order() -> None:
+    """ Unit test for create_dispatcher with split_routes
+
+        Check if the URL that is registered first wins when a static
+        URL and a regex URL match the same path, in both orders.
+    """
+    endpoint = Endpoint(url_suffix=[], func=lambda auth, match: None)
+    regex_first = EndpointURL('users/[a-z]+', endpoint)
+    static_second = EndpointURL('users/me', endpoint)
+    static_first = EndpointURL('tags/new', endpoint)
+    regex_second = EndpointURL('tags/[a-z]+', endpoint)
+    endpoint_urls = [regex_first, static_second, static_first, regex_second]
+
+    # The static URL after the regex URL is matched as regex
+    static_endpoints, regex_endpoints = split_routes(endpoint_urls)
+    assert static_endpoints == {'tags/new': static_first}
+    assert regex_endpoints == [regex_first, static_second, regex_second]
+
+    dispatch = create_dispatcher(static_endpoints, regex_endpoints)
+    assert dispatch('users/me')[0] is regex_first
+    assert dispatch('tags/new')[0] is static_first
+    assert dispatch('tags/old')[0] is regex_second